@@ -0,0 +1,3 @@
+from .style_cli import main
+
+main()
@@ -0,0 +1,46 @@
+# Resident memory benchmark: Python heap held by a worker after every node listed its
+# styles once, with the packs parsed from JSON versus served from the mapped store.
+# Each mode runs in a fresh interpreter.
+#
+#   python benchmarks/bench_memory.py
+import importlib
+import os
+import subprocess
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def worker():
+    sys.path.insert(0, os.path.dirname(ROOT))
+    tracemalloc.start()
+    nodes = importlib.import_module(f"{os.path.basename(ROOT)}.sdxl_prompt_styler")
+    for node_class in nodes.NODE_CLASS_MAPPINGS.values():
+        node_class.INPUT_TYPES()
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"{current / 2**20:.2f} {peak / 2**20:.2f}")
+
+
+def run(cache_enabled):
+    env = dict(os.environ, PROMPT_STYLERS_CACHE='1' if cache_enabled else '0')
+    output = subprocess.run([sys.executable, __file__, '--worker'], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return [float(value) for value in output.split()[-2:]]
+
+
+def main():
+    # Make sure the store exists so the mapped run measures a cache hit
+    run(True)
+
+    print(f"{'mode':<24}{'heap MiB':>10}{'peak MiB':>10}")
+    for name, cache_enabled in (("JSON", False), ("memory-mapped store", True)):
+        current, peak = run(cache_enabled)
+        print(f"{name:<24}{current:>10.2f}{peak:>10.2f}")
+
+
+if __name__ == '__main__':
+    if '--worker' in sys.argv:
+        worker()
+    else:
+        main()
@@ -0,0 +1,44 @@
+# Per-call rendering cost of a style: str.replace on the raw template (the old path)
+# versus a join over the template segments compiled when the pack loads.
+#
+#   python benchmarks/bench_render.py [--number N]
+import argparse
+import importlib
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+package = os.path.basename(ROOT)
+
+style_registry = importlib.import_module(f"{package}.style_registry")
+style_template = importlib.import_module(f"{package}.style_template")
+
+TEXT = "a futuristic pop up tent in a forest, golden hour, volumetric light"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=200000)
+    args = parser.parse_args()
+
+    json_data = style_registry.read_json_file(os.path.join(ROOT, 'sdxl_styles_all.json'))
+    templates = [t for t in json_data if isinstance(t.get('prompt'), str) and '{prompt}' in t['prompt']]
+    cases = [
+        ("shortest template", min(templates, key=lambda t: len(t['prompt']))),
+        ("median template", sorted(templates, key=lambda t: len(t['prompt']))[len(templates) // 2]),
+        ("longest template", max(templates, key=lambda t: len(t['prompt']))),
+    ]
+
+    print(f"{'case':<20}{'chars':>7}{'replace ns':>12}{'join ns':>10}")
+    for name, raw in cases:
+        compiled = style_template.StyleTemplate(raw['name'], raw['prompt'], raw['negative_prompt'])
+        prompt = raw['prompt']
+        before = timeit.timeit(lambda: prompt.replace('{prompt}', TEXT), number=args.number)
+        after = timeit.timeit(lambda: compiled.render(TEXT), number=args.number)
+        print(f"{name:<20}{len(prompt):>7}{before / args.number * 1e9:>12.1f}{after / args.number * 1e9:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# Cold start benchmark: time until every style pack is available, comparing the old
+# per-node read_json_file path with the registry's compiled cache.
+#
+#   python benchmarks/bench_startup.py [--repeat N]
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+package = os.path.basename(ROOT)
+
+style_cache = importlib.import_module(f"{package}.style_cache")
+style_registry = importlib.import_module(f"{package}.style_registry")
+nodes = importlib.import_module(f"{package}.sdxl_prompt_styler")
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def json_every_node():
+    # What the first /object_info used to cost: each node class parsed its own pack
+    for node_class in nodes.NODE_CLASS_MAPPINGS.values():
+        if not hasattr(node_class, 'STYLE_FILE'):
+            continue
+        style_registry.read_sdxl_styles(style_registry.read_json_file(os.path.join(ROOT, node_class.STYLE_FILE)))
+
+
+def json_every_pack():
+    # Each pack file parsed exactly once
+    for file_name in style_registry.list_style_files():
+        style_registry.read_json_file(os.path.join(ROOT, file_name))
+
+
+def registry(cache_enabled, keep_cache):
+    def run():
+        if not keep_cache and os.path.exists(style_cache.cache_file_path()):
+            os.remove(style_cache.cache_file_path())
+        style_registry.CACHE_ENABLED = cache_enabled
+        style_registry.LAZY_LOADING = False
+        style_registry.clear_style_registry()
+        style_registry.preload_style_packs()
+    return run
+
+
+def first_ui_response(lazy):
+    # Style lists of every node, what the first /object_info request needs
+    def run():
+        style_registry.CACHE_ENABLED = True
+        style_registry.LAZY_LOADING = lazy
+        style_registry.clear_style_registry()
+        for file_name in style_registry.list_style_files():
+            style_registry.get_style_names(file_name)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        style_cache.CACHE_DIR = cache_dir
+        cases = [
+            ("read_json_file per node", json_every_node),
+            ("read_json_file per pack", json_every_pack),
+            ("registry, cache disabled", registry(False, False)),
+            ("registry, building cache", registry(True, False)),
+            ("registry, cache hit", registry(True, True)),
+            ("style names, eager", first_ui_response(False)),
+            ("style names, lazy", first_ui_response(True)),
+        ]
+        # Warm the page cache so every case reads the files from memory
+        json_every_pack()
+        registry(True, True)()
+        first_ui_response(True)()
+
+        print(f"{'case':<28}{'median ms':>12}{'min ms':>10}")
+        for name, func in cases:
+            timings = measure(func, args.repeat)
+            print(f"{name:<28}{statistics.median(timings) * 1000:>12.2f}{min(timings) * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Checks that stacking styles keeps the emphasis brackets of the merged negative prompt
+# balanced. Styles of every bundled pack whose negative prompts carry ( ) groups are
+# stacked in pairs through read_sdxl_templates_stack; a merge that keeps one half of a
+# group and drops the other as a duplicate term shows up as an unbalanced result.
+# Exits with status 1 on any unbalanced merge.
+#
+#   python benchmarks/check_negative_merge.py [--styles 60]
+import argparse
+import importlib
+import itertools
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+package = os.path.basename(ROOT)
+
+style_registry = importlib.import_module(f"{package}.style_registry")
+nodes = importlib.import_module(f"{package}.sdxl_prompt_styler")
+
+# Emphasis brackets, escaped \( \) are plain text
+_BRACKETS = re.compile(r'\\.|[()]')
+
+
+def balanced(text):
+    depth = 0
+    for match in _BRACKETS.finditer(text):
+        if match.group() == '(':
+            depth += 1
+        elif match.group() == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that stacked negative prompts keep balanced brackets.")
+    parser.add_argument('--styles', type=int, default=60, help="bracketed styles stacked in pairs per pack")
+    args = parser.parse_args()
+
+    merges = 0
+    failures = []
+    for pack in style_registry.list_style_packs():
+        style_pack = style_registry.get_style_pack(style_registry.style_file_name(pack))
+        names = [name for name in style_pack.names
+                 if '(' in style_pack.index[name].negative_prompt and balanced(style_pack.index[name].negative_prompt)][:args.styles]
+        for first, second in itertools.permutations(names, 2):
+            _, negative_prompt = nodes.read_sdxl_templates_stack([(pack, first), (pack, second)], "", "", {pack: style_pack})
+            merges += 1
+            if not balanced(negative_prompt):
+                failures.append((pack, first, second, negative_prompt))
+
+    for pack, first, second, negative_prompt in failures[:10]:
+        print(f"{pack}/{first} + {pack}/{second}: {negative_prompt}")
+    print(f"{merges} merges, {len(failures)} unbalanced")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# Offline benchmark suite: load, lookup, render and object_info paths. Every case is
+# timed and then run once more under tracemalloc for its memory use; results are
+# written as JSON so two runs can be compared.
+#
+#   python benchmarks/run_all.py [--quick] [--output results.json] [--compare baseline.json]
+#
+# --compare prints the change of every case against an earlier result file and exits
+# with status 1 when a case got slower than --threshold (default 1.10, i.e. 10%).
+import argparse
+import contextlib
+import gc
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+package = os.path.basename(ROOT)
+
+style_cache = importlib.import_module(f"{package}.style_cache")
+style_registry = importlib.import_module(f"{package}.style_registry")
+style_memo = importlib.import_module(f"{package}.style_memo")
+nodes = importlib.import_module(f"{package}.sdxl_prompt_styler")
+
+TEXT = "a futuristic pop up tent in a forest, golden hour, volumetric light"
+
+
+def size_classes():
+    # Smallest, median, second largest and largest pack file, e.g. 11 entries up to "all"
+    files = sorted(style_registry.list_style_files(), key=lambda f: os.path.getsize(os.path.join(ROOT, f)))
+    return [("small", files[0]), ("medium", files[len(files) // 2]), ("large", files[-2]), ("all", files[-1])]
+
+
+def calibrate(func, round_time):
+    # Calls per round so that one round takes at least round_time seconds
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= round_time:
+            return loops
+        loops *= 2
+
+
+def timing(func, loops, repeat):
+    # Seconds per call of every round
+    rounds = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        rounds.append((time.perf_counter() - start) / loops)
+    return rounds
+
+
+def memory(func):
+    # Bytes allocated and still held after one call, and the peak during it
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def build_cases():
+    # (name, function, details) of every case
+    cases = []
+
+    for size, file_name in size_classes():
+        path = os.path.join(ROOT, file_name)
+        entries = len(style_registry.read_json_file(path))
+        cases.append((f"read_json_file[{size}]", lambda path=path: style_registry.read_json_file(path),
+                      {'file': file_name, 'bytes': os.path.getsize(path), 'entries': entries}))
+
+    all_path = os.path.join(ROOT, size_classes()[-1][1])
+    all_data = style_registry.read_json_file(all_path)
+    all_index = style_registry.build_style_index(all_data)
+    cases.append(("read_sdxl_styles[all]", lambda: style_registry.read_sdxl_styles(all_data), {}))
+
+    # Worst cases for the old linear scan: the last style of the largest pack, and a
+    # name that is not there. A raw list is scanned for the name on every call.
+    last_name = all_data[-1]['name']
+    replace_and_combine = nodes.read_sdxl_templates_replace_and_combine
+    cases.append(("replace_and_combine[index, last style]",
+                  lambda: replace_and_combine(all_index, last_name, TEXT, "blurry"), {'style': last_name}))
+    cases.append(("replace_and_combine[index, missing style]",
+                  lambda: replace_and_combine(all_index, "no such style", TEXT, "blurry"), {}))
+    cases.append(("replace_and_combine[raw list, last style]",
+                  lambda: replace_and_combine(all_data, last_name, TEXT, "blurry"), {'style': last_name}))
+
+    node_classes = list(nodes.NODE_CLASS_MAPPINGS.values())
+    cases.append(("INPUT_TYPES[all nodes]", lambda: [node_class.INPUT_TYPES() for node_class in node_classes],
+                  {'nodes': len(node_classes)}))
+
+    # End to end through a per-pack node of the largest pack, with and without a memo hit
+    node_class = next(c for c in node_classes if getattr(c, 'STYLE_FILE', None) == size_classes()[-1][1])
+    node = node_class()
+    counter = iter(range(10**12))
+    cases.append(("prompt_styler[memo hit]",
+                  lambda: node.prompt_styler(TEXT, "blurry", last_name, "No"), {'node': node_class.__name__}))
+    cases.append(("prompt_styler[memo miss]",
+                  lambda: node.prompt_styler(f"{TEXT} {next(counter)}", "blurry", last_name, "No"), {'node': node_class.__name__}))
+
+    return cases
+
+
+def run_suite(quick):
+    repeat = 3 if quick else 10
+    round_time = 0.005 if quick else 0.05
+    results = {}
+
+    # Error cases print, keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = build_cases()
+
+    for name, func, info in cases:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loops = calibrate(func, round_time)
+            rounds = timing(func, loops, repeat)
+            current, peak = memory(func)
+        results[name] = dict(info, **{
+            'loops': loops,
+            'repeat': repeat,
+            'min_us': min(rounds) * 1e6,
+            'median_us': statistics.median(rounds) * 1e6,
+            'stdev_us': statistics.stdev(rounds) * 1e6 if len(rounds) > 1 else 0.0,
+            'retained_bytes': current,
+            'peak_bytes': peak,
+        })
+        print(f"{name:<44}{results[name]['median_us']:>14.2f}{results[name]['min_us']:>12.2f}{peak / 1024:>12.1f}")
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results, baseline_path, threshold):
+    # Fastest round of every case against the baseline, which is less sensitive to
+    # other load on the machine than the median. Returns True on a regression.
+    with open(baseline_path, 'r', encoding='utf8') as file:
+        baseline = json.load(file)['results']
+
+    regressed = False
+    print(f"\n{'case':<44}{'baseline us':>14}{'now us':>12}{'ratio':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['min_us'] / baseline[name]['min_us'] if baseline[name]['min_us'] else 1.0
+        flag = "  slower" if ratio > threshold else ""
+        regressed = regressed or ratio > threshold
+        print(f"{name:<44}{baseline[name]['min_us']:>14.2f}{result['min_us']:>12.2f}{ratio:>8.2f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite of the prompt stylers.")
+    parser.add_argument('--quick', action='store_true', help="fewer rounds and loops, for a smoke run")
+    parser.add_argument('--output', '-o', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="results JSON of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=1.10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Run against a private store so the suite neither uses nor touches the real one
+        style_cache.CACHE_DIR = cache_dir
+        style_registry.clear_style_registry()
+        with contextlib.redirect_stdout(io.StringIO()):
+            style_registry.preload_style_packs()
+        style_memo.styled_prompt_cache.clear()
+
+        print(f"{'case':<44}{'median us':>14}{'min us':>12}{'peak KiB':>12}")
+        results = run_suite(args.quick)
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
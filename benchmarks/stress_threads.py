@@ -0,0 +1,174 @@
+# Concurrency stress test of the registry read path. Reader threads call INPUT_TYPES
+# and prompt_styler nonstop while a writer keeps replacing a pack file with alternating
+# versions, so packs are hot-reloaded under the readers. Versions add and remove
+# styles and change the length of every prompt. Every result is checked:
+#
+#   - a style list must be exactly one version of the pack, never a mix
+#   - the positive and negative prompt of one call must come from the same version
+#   - the token counts of one call must be those of its prompts
+#
+# A style picked from the list may be gone when the call runs, such calls are counted
+# as missed.
+# Throughput with one reader and with all readers, without writes, shows whether the
+# readers wait on each other. Exits with status 1 on any torn read or error.
+#
+#   python benchmarks/stress_threads.py [--threads 8] [--seconds 3]
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+package = os.path.basename(ROOT)
+
+style_cache = importlib.import_module(f"{package}.style_cache")
+style_registry = importlib.import_module(f"{package}.style_registry")
+style_tokens = importlib.import_module(f"{package}.style_tokens")
+nodes = importlib.import_module(f"{package}.sdxl_prompt_styler")
+
+PACK = 'sdxl_styles_stress.json'
+STYLES = 200
+
+
+def version_styles(version):
+    # Odd versions drop the odd styles
+    return [i for i in range(STYLES) if version % 2 == 0 or i % 2 == 0]
+
+
+def pack_version(version):
+    # Every field carries the version, and each version has its own marker style. The
+    # padding makes the token counts of neighbouring versions differ.
+    padding = "detail " * (version % 4)
+    return [{'name': f"version {version}", 'prompt': f"v{version} marker {padding}{{prompt}}", 'negative_prompt': f"v{version} {padding}marker"}] + \
+        [{'name': f"style {i}", 'prompt': f"v{version} style {i} {padding}{{prompt}}", 'negative_prompt': f"v{version} {padding}negative {i}"}
+         for i in version_styles(version)]
+
+
+def write_version(directory, version):
+    # Written next to the pack and moved over it, like an editor saving atomically
+    path = os.path.join(directory, PACK)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf8') as file:
+        json.dump(pack_version(version), file)
+    os.replace(tmp_path, path)
+
+
+def check_names(names):
+    markers = [name for name in names if name.startswith("version ")]
+    return len(markers) == 1 and len(names) == len(version_styles(int(markers[0].split()[1]))) + 1
+
+
+def check_prompts(positive, negative):
+    return positive.split(' ', 1)[0] == negative.split(' ', 1)[0]
+
+
+def check_tokens(positive, negative, positive_tokens, negative_tokens):
+    return positive_tokens == style_tokens.count_tokens(positive) and negative_tokens == style_tokens.count_tokens(negative)
+
+
+class Reader(threading.Thread):
+
+    def __init__(self, node_class, stop):
+        super().__init__(daemon=True)
+        self.node_class = node_class
+        self.stop = stop
+        self.calls = 0
+        self.missed = 0
+        self.torn = 0
+        self.errors = []
+
+    def run(self):
+        node = self.node_class()
+        rng = random.Random(self.name)
+        while not self.stop.is_set():
+            try:
+                names = self.node_class.INPUT_TYPES()["required"]["style"][0]
+                if not check_names(names):
+                    self.torn += 1
+                # Unique texts, so every call renders instead of hitting the memo
+                try:
+                    positive, negative, positive_tokens, negative_tokens = node.prompt_styler(
+                        f"cat {self.calls}", "blurry", rng.choice(names), "No")
+                except ValueError as e:
+                    # The node found no such style: removed by a reload since the list was read
+                    if not str(e).startswith('Unknown style'):
+                        raise
+                    self.missed += 1
+                    continue
+                if not check_prompts(positive, negative) or not check_tokens(positive, negative, positive_tokens, negative_tokens):
+                    self.torn += 1
+                self.calls += 1
+            except Exception as e:
+                self.errors.append(repr(e))
+
+
+def run(node_class, thread_count, seconds, directory, write):
+    stop = threading.Event()
+    readers = [Reader(node_class, stop) for _ in range(thread_count)]
+    versions = 0
+
+    for reader in readers:
+        reader.start()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        if write:
+            versions += 1
+            write_version(directory, versions)
+        time.sleep(0.002)
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    calls = sum(reader.calls for reader in readers)
+    missed = sum(reader.missed for reader in readers)
+    torn = sum(reader.torn for reader in readers)
+    errors = [error for reader in readers for error in reader.errors]
+    return calls, missed, torn, errors, versions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress the style registry from many threads.")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # A private copy of the packs and the store, checked for changes on every access
+        for file_name in style_registry.list_style_files():
+            shutil.copy(os.path.join(ROOT, file_name), directory)
+        write_version(directory, 0)
+        style_registry.STYLES_DIR = directory
+        style_registry.RELOAD_INTERVAL = 0
+        style_cache.CACHE_DIR = os.path.join(directory, '.cache')
+        style_registry.clear_style_registry()
+        with contextlib.redirect_stdout(io.StringIO()):
+            style_registry.preload_style_packs()
+
+        node_class = nodes.make_prompt_styler_node("SDXLPromptStylerStress", PACK)
+
+        print(f"{'phase':<12}{'readers':>8}{'calls':>10}{'calls/s':>10}{'versions':>10}{'missed':>8}{'torn':>6}{'errors':>8}")
+        failed = False
+        for write in (False, True):
+            for thread_count in sorted({1, args.threads}):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    calls, missed, torn, errors, versions = run(node_class, thread_count, args.seconds, directory, write)
+                phase = "reloading" if write else "static"
+                print(f"{phase:<12}{thread_count:>8}{calls:>10}{calls / args.seconds:>10.0f}{versions:>10}{missed:>8}{torn:>6}{len(errors):>8}")
+                for error in sorted(set(errors))[:5]:
+                    print(f"  {error}")
+                failed = failed or torn > 0 or bool(errors)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
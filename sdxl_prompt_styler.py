@@ -1,1919 +1,563 @@
-import json
 import os
+import re
+import time
+from collections.abc import Mapping
+
+from .style_log import log_styling, log_token_limit
+from .style_memo import styled_prompt_cache
+from .style_metrics import timed_method
+from .style_sampler import parse_pack_weights, sample_styles
+from .style_registry import read_json_file, read_sdxl_styles, build_style_index, find_style_template, get_style_pack, get_style_packs, get_style_names, get_style_index, list_style_files, list_style_packs, style_file_name, style_pack_name
+from .style_tokens import CLIP_TOKEN_BUDGET, count_tokens, truncate_to_tokens
+
+# Optional input of the styler nodes: what to do with a styled prompt longer than one
+# CLIP window (77 tokens, CLIP_TOKEN_BUDGET of them for text). ComfyUI encodes longer
+# prompts in several windows, which weakens the terms past the first one.
+TOKEN_LIMIT_INPUT = (["off", "warn", "truncate"], {"default": "off"})
+
+def combine_negative_prompts(json_negative_prompt, negative_prompt):
+    # Append the user's negative text to the template's negative prompt, if they exist
+    if negative_prompt:
+        return f"{json_negative_prompt}, {negative_prompt}" if json_negative_prompt else negative_prompt
+    return json_negative_prompt
+
+# Commas and the emphasis brackets around them; escaped \( \) are plain text
+_TERM_SYNTAX = re.compile(r'\\.|[(),]')
+
+def split_prompt_terms(prompt):
+    # Comma-separated terms of a prompt. A comma inside a ( ) emphasis group does not
+    # split it, the whole group is one term.
+    terms = []
+    depth = 0
+    start = 0
+    for match in _TERM_SYNTAX.finditer(prompt):
+        char = match.group()
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(depth - 1, 0)
+        elif char == ',' and depth == 0:
+            terms.append(prompt[start:match.start()])
+            start = match.end()
+    terms.append(prompt[start:])
+    return terms
+
+def merge_negative_prompts(*negative_prompts):
+    # Join negative prompts into one, keeping the first occurrence of every
+    # comma-separated term (compared case-insensitively) in order. Emphasis groups
+    # are kept or dropped whole, so the brackets of the result stay balanced.
+    seen = set()
+    terms = []
+    for negative_prompt in negative_prompts:
+        if not negative_prompt:
+            continue
+        for term in split_prompt_terms(negative_prompt):
+            term = term.strip()
+            key = term.lower()
+            if term and key not in seen:
+                seen.add(key)
+                terms.append(term)
+    return ", ".join(terms)
+
+def styled_token_counts(pack, template_name, positive_prompt, negative_prompt):
+    # CLIP token counts of a styled prompt pair, from the counts precomputed per style:
+    # only the user's texts are tokenized, and those counts are remembered
+    prompt_tokens, negative_tokens = pack.token_counts(template_name)
+    template = pack.index[template_name]
+    positive_tokens = prompt_tokens + template.placeholders * count_tokens(positive_prompt)
+    if negative_prompt:
+        # combine_negative_prompts joins the two with ", ", one token for the comma
+        negative_tokens = negative_tokens + 1 + count_tokens(negative_prompt) if template.negative_prompt else count_tokens(negative_prompt)
+    return positive_tokens, negative_tokens
+
+def stacked_token_counts(style_pairs, style_packs, positive_prompt, negative_prompt):
+    # Every style of a stack wraps the text of the one before it
+    positive_tokens = count_tokens(positive_prompt)
+    for pack, template_name in style_pairs:
+        pack = style_packs[pack]
+        positive_tokens = pack.token_counts(template_name)[0] + pack.index[template_name].placeholders * positive_tokens
+    # Merged terms can not be derived from the counts, the merged text is counted
+    return positive_tokens, count_tokens(negative_prompt)
+
+def apply_token_limit(node_name, token_limit, positive_prompt, negative_prompt, positive_tokens, negative_tokens):
+    # "warn" reports a prompt that does not fit one CLIP window, "truncate" also cuts
+    # it to fit. Only a prompt over the budget is ever tokenized here.
+    # Returns positive_prompt, negative_prompt, positive_tokens, negative_tokens.
+    prompts = [positive_prompt, negative_prompt]
+    counts = [positive_tokens, negative_tokens]
+    if token_limit in ("warn", "truncate"):
+        for i, label in enumerate(("positive", "negative")):
+            if counts[i] <= CLIP_TOKEN_BUDGET:
+                continue
+            if token_limit == "truncate":
+                prompts[i] = truncate_to_tokens(prompts[i], CLIP_TOKEN_BUDGET)
+                tokens = count_tokens(prompts[i])
+                log_token_limit(node_name, label, counts[i], CLIP_TOKEN_BUDGET, truncated_to=tokens)
+                counts[i] = tokens
+            else:
+                log_token_limit(node_name, label, counts[i], CLIP_TOKEN_BUDGET)
+    return prompts[0], prompts[1], counts[0], counts[1]
+
+def _find_template(json_data, template_name):
+    # A prebuilt index is a dict lookup. A raw list is scanned for the name, only the
+    # matching entries are validated, instead of indexing the whole list on every call.
+    if isinstance(json_data, list):
+        return find_style_template(json_data, template_name)
+    if not isinstance(json_data, Mapping):
+        raise ValueError("Invalid JSON data. Expected a list of templates.")
+    return json_data.get(template_name)
 
-def read_json_file(file_path):
+def read_sdxl_templates_replace_and_combine(json_data, template_name, positive_prompt, negative_prompt):
     try:
-        # Open file, load JSON content into python dictionary, and return it.
-        with open(file_path, 'r', encoding="utf8", errors='ignore') as file:
-            json_data = json.load(file)
-            return json_data
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
-
+        # Accept a raw list of templates as well as a prebuilt name -> template index
+        template = _find_template(json_data, template_name)
+        if template is None:
+            raise ValueError(f"No template found with name '{template_name}'.")
 
-def read_sdxl_styles(json_data):
-    # Check that data is a list
-    if not isinstance(json_data, list):
-        print("Error: input data must be a list")
-        return None
+        # Fill the {prompt} placeholders of the pre-split template
+        positive_prompt = template.render(positive_prompt)
 
-    names = []
+        negative_prompt = combine_negative_prompts(template.negative_prompt, negative_prompt)
 
-    # Iterate over each item in the data list
-    for item in json_data:
-        # Check that the item is a dictionary
-        if isinstance(item, dict):
-            # Check that 'name' is a key in the dictionary
-            if 'name' in item:
-                # Append the value of 'name' to the names list
-                names.append(item['name'])
-
-    return names
-
-def read_sdxl_templates_replace_and_combine(json_data, template_name, positive_prompt, negative_prompt):
-    try:
-        # Check if json_data is a list
-        if not isinstance(json_data, list):
-            raise ValueError("Invalid JSON data. Expected a list of templates.")
-            
-        for template in json_data:
-            # Check if template contains 'name' and 'prompt' fields
-            if 'name' not in template or 'prompt' not in template:
-                raise ValueError("Invalid template. Missing 'name' or 'prompt' field.")
-            
-            # Replace {prompt} in the matching template
-            if template['name'] == template_name:
-                positive_prompt = template['prompt'].replace('{prompt}', positive_prompt)
-                
-                json_negative_prompt = template.get('negative_prompt', "")
-                if negative_prompt:
-                    negative_prompt = f"{json_negative_prompt}, {negative_prompt}" if json_negative_prompt else negative_prompt
-                else:
-                    negative_prompt = json_negative_prompt
-                
-                return positive_prompt, negative_prompt
-
-        # If function hasn't returned yet, no matching template was found
-        raise ValueError(f"No template found with name '{template_name}'.")
+        return positive_prompt, negative_prompt
 
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
+def read_sdxl_templates_replace_and_combine_pack(pack, template_name, positive_prompt, negative_prompt):
+    # Memoized styling with one snapshot of a pack, the StylePack the caller also reads
+    # token counts from. The pack signature is part of the key, so a reloaded pack
+    # never serves results rendered from its previous version.
+    key = (pack.file_path, pack.signature, template_name, positive_prompt, negative_prompt)
+
+    result = styled_prompt_cache.get(key)
+    if result is None:
+        result = read_sdxl_templates_replace_and_combine(pack.index, template_name, positive_prompt, negative_prompt)
+        if result is not None:
+            styled_prompt_cache.put(key, result)
+
+    return result
+
+def read_sdxl_templates_stack(style_pairs, positive_prompt, negative_prompt, style_packs=None):
+    # Apply several styles in one pass. style_pairs is an ordered list of
+    # (pack, style name) pairs; the first style wraps the user's text, every following
+    # style wraps the result of the previous one. The negative prompts of all styles
+    # and the user's negative text are merged without duplicate terms.
+    # style_packs: {pack name: StylePack} to style with, see get_style_packs
+    try:
+        if style_packs is None:
+            style_packs = get_style_packs(pack for pack, _ in style_pairs)
+        templates = []
+        for pack, template_name in style_pairs:
+            template = style_packs[pack].index.get(template_name)
+            if template is None:
+                raise ValueError(f"No template found with name '{template_name}' in pack '{pack}'.")
+            templates.append(template)
 
-class SDXLPromptStylerMisc:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_misc.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+        for template in templates:
+            positive_prompt = template.render(positive_prompt)
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+        negative_prompt = merge_negative_prompts(*[template.negative_prompt for template in templates], negative_prompt)
 
         return positive_prompt, negative_prompt
 
-class SDXLPromptStylerAll:
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+
+def read_sdxl_templates_replace_and_combine_batch(json_data, template_names, positive_prompts, negative_prompts, mode="cartesian"):
+    # Style many prompts with many styles in one pass.
+    # "cartesian" pairs every prompt with every style, "zip" pairs them by position
+    # (a single prompt or style is repeated to match the other list).
+    # Returns lists of positive prompts, negative prompts and the style used for each.
+    try:
+        if not isinstance(json_data, (list, Mapping)):
+            raise ValueError("Invalid JSON data. Expected a list of templates.")
 
-    def __init__(self):
-        pass
+        # Negative texts belong to the prompt at the same position
+        if len(negative_prompts) == 1:
+            negative_prompts = list(negative_prompts) * len(positive_prompts)
+        if len(negative_prompts) != len(positive_prompts):
+            raise ValueError("Expected one negative text, or one per positive text.")
+
+        # Look up each selected template once, templates are already pre-split
+        templates = []
+        for template_name in template_names:
+            template = _find_template(json_data, template_name)
+            if template is None:
+                raise ValueError(f"No template found with name '{template_name}'.")
+            templates.append(template)
+
+        prompts = list(zip(positive_prompts, negative_prompts))
+        if mode == "cartesian":
+            pairs = [(prompt, template) for prompt in prompts for template in templates]
+        elif mode == "zip":
+            count = max(len(prompts), len(templates))
+            if len(prompts) not in (1, count) or len(templates) not in (1, count):
+                raise ValueError("In zip mode the prompt and style lists must have the same length.")
+            pairs = [(prompts[i % len(prompts)], templates[i % len(templates)]) for i in range(count)]
+        else:
+            raise ValueError(f"Unknown batch mode '{mode}'.")
+
+        positive_outputs, negative_outputs, style_outputs = [], [], []
+        for (positive_prompt, negative_prompt), template in pairs:
+            positive_outputs.append(template.render(positive_prompt))
+            negative_outputs.append(combine_negative_prompts(template.negative_prompt, negative_prompt))
+            style_outputs.append(template.name)
+
+        return positive_outputs, negative_outputs, style_outputs
 
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_all.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+# Keep /object_info small: the per-pack nodes declare 'style' as a text input instead
+# of embedding their full style list. No widget ships for it, the style name is typed
+# (GET /prompt_stylers/styles and /prompt_stylers/search list the names).
+COMPACT_OBJECT_INFO = os.environ.get('PROMPT_STYLERS_COMPACT_OBJECT_INFO', '0') == '1'
+
+# Node class and display name of every bundled pack. Class names must stay stable
+# because saved workflows refer to them. Packs found on disk that are not listed
+# here get a node named after their file.
+STYLE_PACK_NODES = {
+    'sdxl_styles_all.json': ("SDXLPromptStylerAll", "Prompt Styler All"),
+    'sdxl_styles_artists.json': ("SDXLPromptStylerbyArtist", "Prompt Styler Artist"),
+    'sdxl_styles_camera.json': ("SDXLPromptStylerbyCamera", "Prompt Styler Camera"),
+    'sdxl_styles_celticart.json': ("SDXLPromptbyCelticArt", "Prompt Styler Celtic Art"),
+    'sdxl_styles_composition.json': ("SDXLPromptStylerbyComposition", "Prompt Styler Composition"),
+    'sdxl_styles_contempnordic.json': ("SDXLPromptbyContemporaryNordicArt", "Prompt Styler Contemporary Nordic Art"),
+    'sdxl_styles_cs.json': ("SDXLPromptStylerbyCyberpunkSurrealism", "Prompt Styler Cyberpunk Surrealism"),
+    'sdxl_styles_depth.json': ("SDXLPromptStylerbyDepth", "Prompt Styler Depth"),
+    'sdxl_styles_environment.json': ("SDXLPromptStylerbyEnvironment", "Prompt Styler Environment"),
+    'sdxl_styles_fashion.json': ("SDXLPromptbyFashionArt", "Prompt Styler Fashion"),
+    'sdxl_styles_filter.json': ("SDXLPromptStylerbyFilter", "Prompt Styler Filter"),
+    'sdxl_styles_focus.json': ("SDXLPromptStylerbyFocus", "Prompt Styler Focus"),
+    'sdxl_styles_fs.json': ("SDXLPromptStylerbyFantasySetting", "Prompt Styler Fantasy-Setting"),
+    'sdxl_styles_gothrev.json': ("SDXLPromptbyGothicRevival", "Prompt Styler Gothic Revival"),
+    'sdxl_styles_horror.json': ("SDXLPromptStylerHorror", "Prompt Styler Horror"),
+    'sdxl_styles_iclandiccontemp.json': ("SDXLPromptbyIcelandicContemporaryArt", "Prompt Styler Icelandic Contemporary Art"),
+    'sdxl_styles_impressionism.json': ("SDXLPromptStylerbyImpressionism", "Prompt Styler Impressionism"),
+    'sdxl_styles_irishfolkart.json': ("SDXLPromptbyIrishFolkArt", "Prompt Styler Irish Folk Art"),
+    'sdxl_styles_lighting.json': ("SDXLPromptStylerbyLighting", "Prompt Styler Lighting"),
+    'sdxl_styles_mc.json': ("SDXLPromptStylerbyMythicalCreature", "Prompt Styler Mythical Creature"),
+    'sdxl_styles_mh.json': ("SDXLPromptStylerbyMileHigh", "Prompt Styler MileHigh"),
+    'sdxl_styles_misc.json': ("SDXLPromptStylerMisc", "Prompt Styler Misc"),
+    'sdxl_styles_mood.json': ("SDXLPromptStylerbyMood", "Prompt Styler Mood"),
+    'sdxl_styles_original.json': ("SDXLPromptStylerbyOriginal", "Prompt Styler Original"),
+    'sdxl_styles_qr.json': ("SDXLPromptStylerbyQuantumRealism", "Prompt Styler Quantum Realism"),
+    'sdxl_styles_romanticnat.json': ("SDXLPromptbyRomanticNationalismArt", "Prompt Styler Romantic Nationalism"),
+    'sdxl_styles_sports.json': ("SDXLPromptbySportsArt", "Prompt Styler Sports"),
+    'sdxl_styles_sr.json': ("SDXLPromptStylerbySteamPunkRealism", "Prompt Styler SteamPunk Realism"),
+    'sdxl_styles_street.json': ("SDXLPromptbyStreetArt", "Prompt Styler Street"),
+    'sdxl_styles_subject.json': ("SDXLPromptStylerbySubject", "Prompt Styler Subject"),
+    'sdxl_styles_surrealism.json': ("SDXLPromptStylerbySurrealism", "Prompt Styler Surrealism"),
+    'sdxl_styles_themes.json': ("SDXLPromptStylerbyTheme", "Prompt Styler Theme"),
+    'sdxl_styles_tod.json': ("SDXLPromptStylerbyTimeofDay", "Prompt Styler Time of Day"),
+    'sdxl_styles_viking.json': ("SDXLPromptbyVikingArt", "Prompt Styler Viking Art"),
+    'sdxl_styles_wildlife.json': ("SDXLPromptbyWildlifeArt", "Prompt Styler Wildlife"),
+    'sdxl_styles_wyvern.json': ("SDXLPromptStylerbyWyvern", "Prompt Styler Wyvern"),
+}
 
-        return positive_prompt, negative_prompt
 
+class SDXLPromptStylerBase:
+    # Shared implementation of the per-pack styler nodes, generated subclasses only
+    # set STYLE_FILE
 
-class SDXLPromptStylerHorror:
+    STYLE_FILE = None
 
     def __init__(self):
         pass
 
     @classmethod
+    @timed_method('input_types')
     def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_horror.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+        # Retrieve styles from the shared style registry, the pack is parsed only once
+        styles = get_style_names(self.STYLE_FILE)
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyArtist:
-
-    def __init__(self):
-        pass
+        if COMPACT_OBJECT_INFO:
+            # Style names are checked by VALIDATE_INPUTS when the prompt is queued
+            style_input = ("STRING", {"default": styles[0] if styles else ""})
+        else:
+            style_input = ((styles), )
 
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_artists.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
         return {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                "style": style_input,
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
+            "optional": {
+                "token_limit": TOKEN_LIMIT_INPUT,
+            },
         }
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyFocus:
-
-    def __init__(self):
-        pass
+    @classmethod
+    def IS_CHANGED(self, **kwargs):
+        # ComfyUI compares the inputs itself, only an edited pack file changes the output
+        return get_style_pack(self.STYLE_FILE).signature
 
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_focus.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    def VALIDATE_INPUTS(self, style=None):
+        # Typed names in compact mode are not checked against a list by ComfyUI; an
+        # unknown one is reported when the prompt is queued instead of failing the run.
+        # A linked input is not known yet and arrives as None.
+        if style is None:
+            return True
+        try:
+            resolve_style_name(get_style_pack(self.STYLE_FILE).index, style, style_pack_name(self.STYLE_FILE))
+        except ValueError as e:
+            return str(e)
+        return True
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
+    RETURN_TYPES = ('STRING','STRING','INT','INT',)
+    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g','positive_tokens','negative_tokens',)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
+    @timed_method('prompt_styler')
+    def prompt_styler(self, text_positive, text_negative, style, log_prompt, token_limit="off"):
         # Process and combine prompts in templates
         # The function replaces the positive prompt placeholder in the template,
         # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyTheme:
-
-    def __init__(self):
-        pass
+        start = time.perf_counter()
+        # One snapshot of the pack for the prompts and their token counts
+        pack = get_style_pack(self.STYLE_FILE)
+        style = resolve_style_name(pack.index, style, style_pack_name(self.STYLE_FILE))
+        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine_pack(pack, style, text_positive, text_negative)
+        positive_prompt, negative_prompt, positive_tokens, negative_tokens = apply_token_limit(
+            type(self).__name__, token_limit, positive_prompt, negative_prompt,
+            *styled_token_counts(pack, style, text_positive, text_negative))
 
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_themes.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+        # If logging is enabled (log_prompt is set to "Yes"), queue a structured record
+        # of the styling, see style_log for the sinks
+        if log_prompt == "Yes":
+            log_styling(type(self).__name__, style, text_positive, text_negative, positive_prompt, negative_prompt,
+                        time.perf_counter() - start, pack=style_pack_name(self.STYLE_FILE))
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+        return positive_prompt, negative_prompt, positive_tokens, negative_tokens
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
 
-        return positive_prompt, negative_prompt
+def style_pack_node_names(file_name):
+    # Class and display name of the node for a pack file
+    if file_name in STYLE_PACK_NODES:
+        return STYLE_PACK_NODES[file_name]
 
-class SDXLPromptStylerbyEnvironment:
+    words = [word for word in re.split(r'[^0-9A-Za-z]+', file_name[len('sdxl_styles_'):-len('.json')]) if word]
+    return f"SDXLPromptStyler{''.join(word.capitalize() for word in words)}", f"Prompt Styler {' '.join(word.capitalize() for word in words)}"
 
-    def __init__(self):
-        pass
+def make_prompt_styler_node(class_name, file_name):
+    return type(class_name, (SDXLPromptStylerBase,), {'STYLE_FILE': file_name})
 
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_environment.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+def resolve_style_name(index, name, pack):
+    # Typed and listed names may carry stray whitespace, but a few real names have
+    # some too: the exact name wins, then the stripped one. Unknown names raise.
+    if name in index:
+        return name
+    if name.strip() in index:
+        return name.strip()
+    raise ValueError(f"Unknown style '{name.strip()}' in pack '{pack}'.")
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+def parse_style_pairs(text):
+    # "pack/style" lines into (pack, style) pairs, blank lines are ignored. Styles keep
+    # their whitespace for resolve_style_name, a few names have some.
+    pairs = []
+    for line in text.splitlines():
+        if line.strip():
+            pack, _, style = line.partition('/')
+            pairs.append((pack.strip(), style))
+    return pairs
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+def resolve_style_pairs(style_pairs, style_packs):
+    # (pack, style) pairs with the names as their packs spell them, see resolve_style_name
+    return [(pack, resolve_style_name(style_packs[pack].index, style, pack)) for pack, style in style_pairs]
 
-        return positive_prompt, negative_prompt
 
-class SDXLPromptStylerbyMood:
+class SDXLPromptStylerBatch:
 
     def __init__(self):
         pass
 
     @classmethod
+    @timed_method('input_types')
     def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_mood.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
         return {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                "pack": (list_style_packs(), {"default": "all"}),
+                "styles": ("STRING", {"default": "", "multiline": True}),
+                "mode": (["cartesian", "zip"], {"default": "cartesian"}),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
+            "optional": {
+                "token_limit": TOKEN_LIMIT_INPUT,
+            },
         }
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbySubject:
-
-    def __init__(self):
-        pass
-
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_subject.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    def IS_CHANGED(self, pack, **kwargs):
+        # Inputs arrive as lists, only an edited pack file changes the output
+        return get_style_pack(style_file_name(pack[0])).signature
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
+    # Every input arrives as a list, so prompts can come from list outputs of other nodes
+    INPUT_IS_LIST = True
+    RETURN_TYPES = ('STRING','STRING','STRING','INT','INT',)
+    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g','style','positive_tokens','negative_tokens',)
+    OUTPUT_IS_LIST = (True, True, True, True, True,)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyTimeofDay:
+    @timed_method('prompt_styler')
+    def prompt_styler(self, text_positive, text_negative, pack, styles, mode, log_prompt, token_limit=("off",)):
+        # Styles are given one per line, blank lines are ignored
+        start = time.perf_counter()
+        style_pack = get_style_pack(style_file_name(pack[0]))
+        style_names = [resolve_style_name(style_pack.index, line, pack[0])
+                       for text in styles for line in text.splitlines() if line.strip()]
+        positive_prompts, negative_prompts, styled = read_sdxl_templates_replace_and_combine_batch(
+            style_pack.index, style_names, text_positive, text_negative, mode[0])
+        elapsed = time.perf_counter() - start
 
-    def __init__(self):
-        pass
+        # Input text of every output, in the order the batch function pairs them
+        negatives = text_negative * len(text_positive) if len(text_negative) == 1 else text_negative
+        sources = [i // len(style_names) if mode[0] == "cartesian" else i % len(text_positive) for i in range(len(styled))]
 
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_tod.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+        positive_counts, negative_counts = [], []
+        for i, (style, j) in enumerate(zip(styled, sources)):
+            positive_prompts[i], negative_prompts[i], positive_tokens, negative_tokens = apply_token_limit(
+                type(self).__name__, token_limit[0], positive_prompts[i], negative_prompts[i],
+                *styled_token_counts(style_pack, style, text_positive[j], negatives[j]))
+            positive_counts.append(positive_tokens)
+            negative_counts.append(negative_tokens)
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+        if log_prompt[0] == "Yes":
+            # The batch is timed as a whole, each record gets an equal share
+            elapsed = elapsed / max(len(positive_prompts), 1)
+            for style, j, positive_prompt, negative_prompt in zip(styled, sources, positive_prompts, negative_prompts):
+                log_styling(type(self).__name__, style, text_positive[j], negatives[j], positive_prompt, negative_prompt,
+                            elapsed, pack=pack[0])
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+        return positive_prompts, negative_prompts, styled, positive_counts, negative_counts
 
-        return positive_prompt, negative_prompt
 
-class SDXLPromptStylerbyCamera:
+class SDXLPromptStylerStack:
 
     def __init__(self):
         pass
 
     @classmethod
+    @timed_method('input_types')
     def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_camera.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
         return {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                # One "pack/style" per line, e.g. "misc/sai-enhance_", applied top to bottom
+                "styles": ("STRING", {"default": "", "multiline": True}),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
+            "optional": {
+                "token_limit": TOKEN_LIMIT_INPUT,
+            },
         }
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyComposition:
-
-    def __init__(self):
-        pass
-
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_composition.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    def IS_CHANGED(self, styles, **kwargs):
+        # ComfyUI compares the inputs itself, only an edited pack file changes the output
+        return tuple(get_style_pack(style_file_name(pack)).signature for pack in sorted({pack for pack, _ in parse_style_pairs(styles)}))
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
+    RETURN_TYPES = ('STRING','STRING','INT','INT',)
+    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g','positive_tokens','negative_tokens',)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
+    @timed_method('prompt_styler')
+    def prompt_styler(self, text_positive, text_negative, styles, log_prompt, token_limit="off"):
+        style_pairs = parse_style_pairs(styles)
+        start = time.perf_counter()
+        style_packs = get_style_packs({pack for pack, _ in style_pairs})
+        style_pairs = resolve_style_pairs(style_pairs, style_packs)
+        positive_prompt, negative_prompt = read_sdxl_templates_stack(style_pairs, text_positive, text_negative, style_packs)
+        positive_prompt, negative_prompt, positive_tokens, negative_tokens = apply_token_limit(
+            type(self).__name__, token_limit, positive_prompt, negative_prompt,
+            *stacked_token_counts(style_pairs, style_packs, text_positive, negative_prompt))
+
         if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+            log_styling(type(self).__name__, [f"{pack}/{style}" for pack, style in style_pairs], text_positive, text_negative,
+                        positive_prompt, negative_prompt, time.perf_counter() - start)
 
-        return positive_prompt, negative_prompt
+        return positive_prompt, negative_prompt, positive_tokens, negative_tokens
 
-class SDXLPromptStylerbyLighting:
+
+class SDXLPromptStylerSampler:
 
     def __init__(self):
         pass
 
     @classmethod
+    @timed_method('input_types')
     def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_lighting.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
         return {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                # Packs to draw from with optional weights, e.g. "mood:1, artists:2"
+                "packs": ("STRING", {"default": "all"}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
+            "optional": {
+                "token_limit": TOKEN_LIMIT_INPUT,
+            },
         }
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyDepth:
-
-    def __init__(self):
-        pass
-
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_depth.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    def IS_CHANGED(self, packs, **kwargs):
+        # ComfyUI compares the inputs (seed included) itself, only an edited pack file changes the output
+        return tuple(get_style_pack(style_file_name(pack)).signature for pack, _ in parse_pack_weights(packs))
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
+    RETURN_TYPES = ('STRING','STRING','STRING','INT','INT',)
+    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g','style','positive_tokens','negative_tokens',)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
+    @timed_method('prompt_styler')
+    def prompt_styler(self, text_positive, text_negative, packs, seed, log_prompt, token_limit="off"):
+        # The same seed picks the same style on every worker
+        start = time.perf_counter()
+        # The style is drawn from, rendered with and counted on one snapshot of the packs
+        pack_weights = parse_pack_weights(packs)
+        style_packs = get_style_packs({pack for pack, _ in pack_weights})
+        (pack, style), = sample_styles(pack_weights, seed, style_packs=style_packs)
+        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine_pack(style_packs[pack], style, text_positive, text_negative)
+        positive_prompt, negative_prompt, positive_tokens, negative_tokens = apply_token_limit(
+            type(self).__name__, token_limit, positive_prompt, negative_prompt,
+            *styled_token_counts(style_packs[pack], style, text_positive, text_negative))
+
         if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+            log_styling(type(self).__name__, style, text_positive, text_negative, positive_prompt, negative_prompt,
+                        time.perf_counter() - start, pack=pack, seed=seed)
 
-        return positive_prompt, negative_prompt
+        return positive_prompt, negative_prompt, f"{pack}/{style}", positive_tokens, negative_tokens
 
-class SDXLPromptStylerbyFilter:
 
-    def __init__(self):
-        pass
+NODE_CLASS_MAPPINGS = {}
+NODE_DISPLAY_NAME_MAPPINGS = {}
 
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_filter.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyOriginal:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_original.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyMileHigh:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_mh.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-        
-class SDXLPromptStylerbyFantasySetting:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_fs.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyMythicalCreature:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_mc.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-class SDXLPromptStylerbySurrealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_surrealism.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-
-class SDXLPromptStylerbyImpressionism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_impressionism.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyCyberpunkSurrealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_cs.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyQuantumRealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_qr.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbySteamPunkRealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_sr.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyWyvern:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_wyvern.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-        
-class SDXLPromptStylerbyWyvern:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_wyvern.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyGothicRevival:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_gothrev.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyCelticArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_celticart.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyIrishFolkArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_irishfolkart.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbySportsArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_sports.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyFashionArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_fashion.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyWildlifeArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_wildlife.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyStreetArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_street.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyVikingArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_viking.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyRomanticNationalismArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_romanticnat.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyContemporaryNordicArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_contempnordic.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyIcelandicContemporaryArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_contempnordic.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        # Process and combine prompts in templates
-        # The function replaces the positive prompt placeholder in the template,
-        # and combines the negative prompt with the template's negative prompt, if they exist.
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
- 
-        # If logging is enabled (log_prompt is set to "Yes"), 
-        # print the style, positive and negative text, and positive and negative prompts to the console
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
+# One node per pack on disk, all sharing the registry's loader and index
+for file_name in list_style_files():
+    class_name, display_name = style_pack_node_names(file_name)
+    if class_name in NODE_CLASS_MAPPINGS:
+        continue
+    node_class = make_prompt_styler_node(class_name, file_name)
+    # Keep the classes importable under their historic names
+    globals()[class_name] = node_class
+    NODE_CLASS_MAPPINGS[class_name] = node_class
+    NODE_DISPLAY_NAME_MAPPINGS[class_name] = display_name
 
-
-NODE_CLASS_MAPPINGS = {
-    "SDXLPromptStylerAll": SDXLPromptStylerAll,
-    "SDXLPromptStylerbyArtist": SDXLPromptStylerbyArtist,
-    "SDXLPromptStylerbyCamera": SDXLPromptStylerbyCamera,
-    "SDXLPromptbyCelticArt": SDXLPromptbyCelticArt,
-    "SDXLPromptStylerbyComposition": SDXLPromptStylerbyComposition,    
-    "SDXLPromptbyContemporaryNordicArt": SDXLPromptbyContemporaryNordicArt,
-    "SDXLPromptStylerbyCyberpunkSurrealism": SDXLPromptStylerbyCyberpunkSurrealism,
-    "SDXLPromptStylerbyDepth": SDXLPromptStylerbyDepth,
-    "SDXLPromptStylerbyEnvironment": SDXLPromptStylerbyEnvironment,
-    "SDXLPromptStylerbyFantasySetting": SDXLPromptStylerbyFantasySetting,    
-    "SDXLPromptbyFashionArt": SDXLPromptbyFashionArt,    
-    "SDXLPromptStylerbyFilter": SDXLPromptStylerbyFilter,
-    "SDXLPromptStylerbyFocus": SDXLPromptStylerbyFocus,
-    "SDXLPromptbyGothicRevival": SDXLPromptbyGothicRevival,
-    "SDXLPromptStylerHorror": SDXLPromptStylerHorror,
-    
-    
-    "SDXLPromptStylerbyImpressionism": SDXLPromptStylerbyImpressionism,
-    "SDXLPromptbyIrishFolkArt": SDXLPromptbyIrishFolkArt,
-    "SDXLPromptStylerbyLighting": SDXLPromptStylerbyLighting,
-    "SDXLPromptStylerbyMileHigh": SDXLPromptStylerbyMileHigh,
-    "SDXLPromptStylerMisc": SDXLPromptStylerMisc,
-    "SDXLPromptStylerbyMood": SDXLPromptStylerbyMood,
-    "SDXLPromptStylerbyMythicalCreature": SDXLPromptStylerbyMythicalCreature,    
-    "SDXLPromptStylerbyOriginal": SDXLPromptStylerbyOriginal,
-    "SDXLPromptStylerbyQuantumRealism": SDXLPromptStylerbyQuantumRealism,
-    "SDXLPromptbyRomanticNationalismArt": SDXLPromptbyRomanticNationalismArt,
-    "SDXLPromptbySportsArt": SDXLPromptbySportsArt,    
-    "SDXLPromptStylerbySteamPunkRealism": SDXLPromptStylerbySteamPunkRealism,    
-    "SDXLPromptbyStreetArt": SDXLPromptbyStreetArt,
-    "SDXLPromptStylerbySubject": SDXLPromptStylerbySubject,
-    "SDXLPromptStylerbySurrealism": SDXLPromptStylerbySurrealism,
-    "SDXLPromptStylerbyTheme": SDXLPromptStylerbyTheme,
-    "SDXLPromptStylerbyTimeofDay": SDXLPromptStylerbyTimeofDay,
-    "SDXLPromptbyVikingArt": SDXLPromptbyVikingArt,
-    "SDXLPromptbyWildlifeArt": SDXLPromptbyWildlifeArt,    
-    "SDXLPromptStylerbyWyvern": SDXLPromptStylerbyWyvern,
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "SDXLPromptStylerAll": "Prompt Styler All",
-    "SDXLPromptStylerbyArtist": "Prompt Styler Artist",
-    "SDXLPromptStylerbyCamera": "Prompt Styler Camera",
-    "SDXLPromptbyCelticArt": "Prompt Styler Celtic Art",
-    "SDXLPromptStylerbyComposition": "Prompt Styler Composition",    
-    "SDXLPromptbyContemporaryNordicArt": "Prompt Styler Contemporary Nordic Art",
-    "SDXLPromptStylerbyCyberpunkSurrealism": "Prompt Styler Cyberpunk Surrealism",
-    "SDXLPromptStylerbyDepth": "Prompt Styler Depth",
-    "SDXLPromptStylerbyEnvironment": "Prompt Styler Environment",
-    "SDXLPromptStylerbyFantasySetting": "Prompt Styler Fantasy-Setting",
-    "SDXLPromptbyFashionArt": "Prompt Styler Fashion",
-    "SDXLPromptStylerbyFilter": "Prompt Styler Filter",
-    "SDXLPromptStylerbyFocus": "Prompt Styler Focus",
-    "SDXLPromptbyGothicRevival": "Prompt Styler Gothic Revival",
-    "SDXLPromptStylerHorror": "Prompt Styler Horror",
-    
-    
-    "SDXLPromptStylerbyImpressionism": "Prompt Styler Impressionism",
-    "SDXLPromptbyIrishFolkArt": "Prompt Styler Irish Folk Art",
-    "SDXLPromptStylerbyLighting": "Prompt Styler Lighting",
-    "SDXLPromptStylerbyMileHigh": "Prompt Styler MileHigh",
-    "SDXLPromptStylerMisc": "Prompt Styler Misc",
-    "SDXLPromptStylerbyMood": "Prompt Styler Mood",
-    "SDXLPromptStylerbyMythicalCreature": "Prompt Styler Mythical Creature",    
-    "SDXLPromptStylerbyOriginal": "Prompt Styler Original",
-    "SDXLPromptStylerbyQuantumRealism": "Prompt Styler Quantum Realism",
-    "SDXLPromptbyRomanticNationalismArt": "Prompt Styler Romantic Nationalism",
-    "SDXLPromptbySportsArt": "Prompt Styler Sports",
-    "SDXLPromptStylerbySteamPunkRealism": "Prompt Styler SteamPunk Realism",    
-    "SDXLPromptbyStreetArt": "Prompt Styler Street",
-    "SDXLPromptStylerbySubject": "Prompt Styler Subject",
-    "SDXLPromptStylerbySurrealism": "Prompt Styler Surrealism",
-    "SDXLPromptStylerbyTheme": "Prompt Styler Theme",
-    "SDXLPromptStylerbyTimeofDay": "Prompt Styler Time of Day",    
-    "SDXLPromptbyVikingArt": "Prompt Styler Viking Art",
-    "SDXLPromptbyWildlifeArt": "Prompt Styler Wildlife",
-    "SDXLPromptStylerbyWyvern": "Prompt Styler Wyvern",
-}
+NODE_CLASS_MAPPINGS["SDXLPromptStylerBatch"] = SDXLPromptStylerBatch
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerBatch"] = "Prompt Styler Batch"
+NODE_CLASS_MAPPINGS["SDXLPromptStylerStack"] = SDXLPromptStylerStack
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerStack"] = "Prompt Styler Stack"
+NODE_CLASS_MAPPINGS["SDXLPromptStylerSampler"] = SDXLPromptStylerSampler
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerSampler"] = "Prompt Styler Random"
@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+from array import array
+from collections.abc import Mapping
+
+from .style_schema import iter_style_records, read_style_records, report_problems, share_text
+from .style_stream import SQLITE_EXTENSIONS, SQLITE_SCHEMA, connect_sqlite_pack, iter_pack_entries
+from .style_template import StyleTemplate
+
+# Storage formats of style packs, picked by file extension: JSON like the bundled packs,
+# JSON Lines and CSV, which are easy to append to, and SQLite for big libraries, which
+# is queried per style instead of being loaded. Packs are converted between them with
+#
+#   python -m ComfyUi_PromptStylers.style_backends sdxl_styles_mine.json mine.sqlite
+
+
+class PackBackend:
+    # One storage format: loads a pack for the registry and writes one from records
+
+    name = None
+    extensions = ()
+
+    def load(self, file_path):
+        # Validated StyleRecords, or a pack read on demand that has build_index() like
+        # the compiled store's packs; None when the file can not be read
+        return read_style_records(file_path)
+
+    def save(self, file_path, records):
+        # Written next to the target and moved over it, so a pack that is being
+        # hot-reloaded is never read half written. Returns the number of styles.
+        tmp_path = f"{file_path}.tmp"
+        try:
+            count = self.write(tmp_path, records)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return count
+
+    def write(self, file_path, records):
+        raise NotImplementedError
+
+
+class JsonBackend(PackBackend):
+
+    name = 'json'
+    extensions = ('.json',)
+
+    def write(self, file_path, records):
+        # Laid out like the bundled packs, one entry at a time
+        count = 0
+        with open(file_path, 'w', encoding='utf8') as file:
+            file.write('[')
+            for record in records:
+                entry = json.dumps(record._asdict(), indent=4, ensure_ascii=False)
+                file.write(',\n    ' if count else '\n    ')
+                file.write(entry.replace('\n', '\n    '))
+                count += 1
+            file.write('\n]\n' if count else ']\n')
+        return count
+
+
+class JsonLinesBackend(PackBackend):
+
+    name = 'jsonl'
+    extensions = ('.jsonl',)
+
+    def write(self, file_path, records):
+        count = 0
+        with open(file_path, 'w', encoding='utf8') as file:
+            for record in records:
+                file.write(json.dumps(record._asdict(), ensure_ascii=False) + '\n')
+                count += 1
+        return count
+
+
+class CsvBackend(PackBackend):
+
+    name = 'csv'
+    extensions = ('.csv',)
+
+    def write(self, file_path, records):
+        count = 0
+        with open(file_path, 'w', encoding='utf8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(('name', 'prompt', 'negative_prompt'))
+            for record in records:
+                writer.writerow(record)
+                count += 1
+        return count
+
+
+class SqliteBackend(PackBackend):
+
+    name = 'sqlite'
+    extensions = SQLITE_EXTENSIONS
+
+    def load(self, file_path):
+        try:
+            return SqliteStylePack(file_path)
+        except sqlite3.Error as e:
+            print(f"An error occurred: {os.path.basename(file_path)}: {str(e)}")
+            return None
+
+    def write(self, file_path, records):
+        connection = sqlite3.connect(file_path)
+        try:
+            for statement in SQLITE_SCHEMA:
+                connection.execute(statement)
+            # Rows are numbered in insertion order, which keeps the file order
+            cursor = connection.executemany("INSERT INTO styles (name, prompt, negative_prompt) VALUES (?, ?, ?)", records)
+            connection.commit()
+            return cursor.rowcount
+        finally:
+            connection.close()
+
+
+BACKENDS = (JsonBackend(), JsonLinesBackend(), CsvBackend(), SqliteBackend())
+
+PACK_EXTENSIONS = tuple(extension for backend in BACKENDS for extension in backend.extensions)
+
+
+def pack_backend(file_path):
+    # Backend of a pack file by its extension, JSON for anything else
+    for backend in BACKENDS:
+        if file_path.endswith(backend.extensions):
+            return backend
+    return BACKENDS[0]
+
+
+def _text(value):
+    # Rows may hold NULL or numbers when a pack was not written by the converter
+    if value is None:
+        return ""
+    return share_text(value if isinstance(value, str) else str(value))
+
+
+class SqliteStylePack:
+    # A pack served from SQLite. Only the style names are read up front, for the
+    # dropdowns; a template is queried by its row the first time the style is selected.
+
+    source = 'sqlite'
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._connection = connect_sqlite_pack(file_path)
+        self._lock = threading.Lock()
+        # Fail on load rather than on the first lookup when this is not a style pack
+        self.query("SELECT position, name, prompt, negative_prompt FROM styles LIMIT 1")
+
+    def query(self, sql, parameters=()):
+        # One connection per pack, queries from different threads take turns
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def records(self):
+        # Validated StyleRecords in file order, read in batches
+        return iter_style_records(iter_pack_entries(self.file_path), [], [])
+
+    def templates(self):
+        return [record._asdict() for record in self.records()]
+
+    def build_index(self):
+        # Answered from the index on name; the first definition of a name wins
+        rows = self.query("SELECT name, MIN(position) FROM styles GROUP BY name")
+        rows.sort(key=lambda row: row[1])
+        ids = {}
+        for name, position in rows:
+            if isinstance(name, str) and name.strip():
+                ids[share_text(name)] = position
+        return SqliteStyleIndex(self, ids)
+
+    def names_without_placeholder(self, index):
+        rows = self.query("SELECT name, position FROM styles WHERE prompt IS NULL OR instr(prompt, '{prompt}') = 0 ORDER BY position")
+        return [name for name, position in rows if index._ids.get(name) == position]
+
+
+class SqliteStyleIndex(Mapping):
+
+    def __init__(self, pack, ids):
+        self._pack = pack
+        self._ids = ids
+        self._templates = {}
+
+    def __getitem__(self, name):
+        template = self._templates.get(name)
+        if template is None:
+            # A primary key lookup, compiled and kept the first time the style is selected
+            rows = self._pack.query("SELECT prompt, negative_prompt FROM styles WHERE position = ?", (self._ids[name],))
+            if not rows:
+                raise KeyError(name)
+            template = self._templates[name] = StyleTemplate(name, _text(rows[0][0]), _text(rows[0][1]))
+        return template
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+
+def convert_style_pack(source_path, target_path, backend=None):
+    # Copy a pack into another format, entry by entry, so packs of any size convert
+    # in constant memory. Invalid entries are reported and left out. Returns the
+    # number of styles written.
+    fixed = []
+    rejected = []
+    lines = array('I')
+    backend = backend or pack_backend(target_path)
+    count = backend.save(target_path, iter_style_records(iter_pack_entries(source_path, lines), fixed, rejected))
+    report_problems(source_path, fixed, rejected, lines)
+    return count
+
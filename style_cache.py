@@ -0,0 +1,274 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+from .style_schema import StyleRecord, share_text
+from .style_template import StyleTemplate, count_placeholders
+from .style_tokens import template_token_counts, tokenizer_name
+
+# Bump whenever the layout of the store changes
+CACHE_VERSION = 6
+CACHE_MAGIC = b'PSSM'
+
+# Compiled, memory-mapped store of all style packs, so a cold start does not have to
+# parse ~3 MB of pretty-printed JSON and worker processes share the pages of one
+# file. Set PROMPT_STYLERS_CACHE=0 to always read the JSON files.
+CACHE_ENABLED = os.environ.get('PROMPT_STYLERS_CACHE', '1') != '0'
+CACHE_DIR = os.environ.get('PROMPT_STYLERS_CACHE_DIR', os.path.join(os.path.dirname(os.path.realpath(__file__)), '.cache'))
+
+# Store layout, all integers little-endian:
+#   header         counts, offsets, the size of the style text before deduplication
+#                  and the string id of the tokenizer the token counts were made with
+#   pack table     one entry per pack file: file name, signature, slice of the member table
+#   member table   record ids of each pack, in file order
+#   record table   (name, prompt, negative_prompt) string ids, the number of
+#                  {prompt} placeholders and the CLIP token counts of the prompt
+#                  around them and of the negative prompt, shared by every pack
+#                  that contains the same style, so "All" is a view over the others
+#   string table   (offset, length) of every distinct string in the blob
+#   blob           utf-8 encoded strings, each stored once
+_HEADER = struct.Struct('<4sIIIIIQQQQQQI')
+_PACK = struct.Struct('<IqqII')
+_RECORD = struct.Struct('<IIIIHH')
+# Token counts are stored as 16-bit, no style comes near
+_TOKEN_LIMIT = 0xFFFF
+_STRING = struct.Struct('<QI')
+_MEMBER = struct.Struct('<I')
+
+
+def cache_file_path():
+    return os.path.join(CACHE_DIR, 'sdxl_styles.cache')
+
+
+def name_index_path():
+    return os.path.join(CACHE_DIR, 'sdxl_styles.names.json')
+
+
+def load_name_index(index_path=None):
+    # Names-only sidecar of the store: {file_name: {'signature': [mtime, size], 'names': [...]}}
+    try:
+        with open(index_path or name_index_path(), 'r', encoding='utf8') as file:
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_name_index(entries, index_path=None):
+    index_path = index_path or name_index_path()
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf8') as file:
+            json.dump(entries, file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"Could not write style name index: {str(e)}")
+
+
+def save_style_cache(entries, cache_path=None):
+    # entries: {file_name: (signature, records)} where records are validated
+    # StyleRecords in file order
+    cache_path = cache_path or cache_file_path()
+
+    string_ids = {}
+    strings = []
+    record_ids = {}
+    records = []
+    members = []
+    packs = []
+    # utf-8 size of every string reference, what the packs would take without sharing
+    text_bytes = 0
+
+    def string_id(value):
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = string_ids[value] = len(strings)
+            strings.append(value.encode('utf8', errors='replace'))
+        return sid
+
+    for file_name, (signature, pack_records) in entries.items():
+        start = len(members)
+        for record in pack_records:
+            sids = tuple(string_id(value) for value in record)
+            text_bytes += sum(len(strings[sid]) for sid in sids)
+            key = sids + (count_placeholders(record[1]),)
+            rid = record_ids.get(key)
+            if rid is None:
+                rid = record_ids[key] = len(records)
+                # Token counts are precomputed here, once per distinct style
+                tokens = template_token_counts(StyleTemplate(*record))
+                records.append(key + tuple(min(count, _TOKEN_LIMIT) for count in tokens))
+            members.append(rid)
+        packs.append((string_id(file_name), signature[0], signature[1], start, len(members) - start))
+    tokenizer_id = string_id(tokenizer_name())
+
+    pack_offset = _HEADER.size
+    member_offset = pack_offset + _PACK.size * len(packs)
+    record_offset = member_offset + _MEMBER.size * len(members)
+    string_offset = record_offset + _RECORD.size * len(records)
+    blob_offset = string_offset + _STRING.size * len(strings)
+
+    parts = [_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(packs), len(members), len(records), len(strings),
+                          pack_offset, member_offset, record_offset, string_offset, blob_offset, text_bytes, tokenizer_id)]
+    parts.extend(_PACK.pack(*pack) for pack in packs)
+    parts.append(struct.pack(f'<{len(members)}I', *members))
+    parts.extend(_RECORD.pack(*record) for record in records)
+    position = 0
+    for data in strings:
+        parts.append(_STRING.pack(position, len(data)))
+        position += len(data)
+    parts.extend(strings)
+
+    # Write to a temporary file first so concurrent workers never map a partial store
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'wb') as file:
+            file.write(b''.join(parts))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write style cache: {str(e)}")
+
+
+def open_style_cache(cache_path=None):
+    # Returns a StyleStore, or None when the store is missing, was written by another
+    # version or is damaged
+    cache_path = cache_path or cache_file_path()
+
+    try:
+        with open(cache_path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        return StyleStore(buffer)
+    except (struct.error, ValueError, UnicodeDecodeError):
+        buffer.close()
+        return None
+
+
+class StyleStore:
+
+    def __init__(self, buffer):
+        (magic, version, pack_count, member_count, record_count, string_count,
+         pack_offset, self._member_offset, self._record_offset, self._string_offset,
+         self._blob_offset, self.text_bytes, tokenizer_id) = _HEADER.unpack_from(buffer, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError("Unsupported style cache")
+
+        end = self._blob_offset
+        if string_count:
+            last_offset, last_length = _STRING.unpack_from(buffer, self._string_offset + _STRING.size * (string_count - 1))
+            end += last_offset + last_length
+        if len(buffer) != end:
+            raise ValueError("Truncated style cache")
+        # Size of the deduplicated strings, compare with text_bytes for the saving
+        self.blob_bytes = end - self._blob_offset
+
+        self._buffer = buffer
+        # Decoded strings are shared by every pack that references them
+        self._strings = {}
+
+        # Tokenizer of the precomputed counts. Processes with another one, like the
+        # command line outside ComfyUI, still share the store and count on first use.
+        self.tokenizer = self.string(tokenizer_id)
+        self._counts_usable = None
+
+        self.packs = {}
+        for i in range(pack_count):
+            name_id, mtime, size, start, count = _PACK.unpack_from(buffer, pack_offset + _PACK.size * i)
+            self.packs[self.string(name_id)] = ((mtime, size), start, count)
+
+    def string(self, sid):
+        value = self._strings.get(sid)
+        if value is None:
+            offset, length = _STRING.unpack_from(self._buffer, self._string_offset + _STRING.size * sid)
+            start = self._blob_offset + offset
+            value = self._strings[sid] = share_text(self._buffer[start:start + length].decode('utf8'))
+        return value
+
+    def record_ids(self, start, count):
+        return struct.unpack_from(f'<{count}I', self._buffer, self._member_offset + _MEMBER.size * start)
+
+    def record(self, rid):
+        return _RECORD.unpack_from(self._buffer, self._record_offset + _RECORD.size * rid)
+
+    def counts_usable(self):
+        # Checked on first use, loading the tokenizer is left to the processes that count
+        if self._counts_usable is None:
+            self._counts_usable = self.tokenizer == tokenizer_name()
+        return self._counts_usable
+
+    def signature(self, file_name):
+        pack = self.packs.get(file_name)
+        return pack[0] if pack is not None else None
+
+    def pack(self, file_name):
+        _, start, count = self.packs[file_name]
+        return MappedStylePack(self, self.record_ids(start, count))
+
+
+class MappedStylePack:
+
+    source = 'store'
+
+    def __init__(self, store, record_ids):
+        self._store = store
+        self._record_ids = record_ids
+
+    def records(self):
+        # Fully decoded StyleRecords in file order
+        string = self._store.string
+        for rid in self._record_ids:
+            name_id, prompt_id, negative_id = self._store.record(rid)[:3]
+            yield StyleRecord(string(name_id), string(prompt_id), string(negative_id))
+
+    def templates(self):
+        return [{'name': name, 'prompt': prompt, 'negative_prompt': negative_prompt}
+                for name, prompt, negative_prompt in self.records()]
+
+    def build_index(self):
+        # Only the names are decoded here, templates are decoded on first lookup
+        ids = {}
+        for rid in self._record_ids:
+            ids.setdefault(self._store.string(self._store.record(rid)[0]), rid)
+        return LazyStyleIndex(self._store, ids)
+
+    def names_without_placeholder(self, index):
+        # Read from the record table, no prompt has to be decoded
+        return [name for name, rid in index._ids.items() if self._store.record(rid)[3] == 0]
+
+    def token_counts(self, index, name):
+        # Precomputed when the store was written, None when made with another tokenizer
+        if not self._store.counts_usable():
+            return None
+        return self._store.record(index._ids[name])[4:]
+
+
+class LazyStyleIndex(Mapping):
+
+    def __init__(self, store, ids):
+        self._store = store
+        self._ids = ids
+        self._templates = {}
+
+    def __getitem__(self, name):
+        template = self._templates.get(name)
+        if template is None:
+            # Decoded and compiled the first time the style is selected
+            prompt_id, negative_id = self._store.record(self._ids[name])[1:3]
+            template = self._templates[name] = StyleTemplate(name, self._store.string(prompt_id), self._store.string(negative_id))
+        return template
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        return name in self._ids
@@ -0,0 +1,146 @@
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from .sdxl_prompt_styler import parse_style_pairs, read_sdxl_templates_replace_and_combine, read_sdxl_templates_stack, resolve_style_pairs
+from .style_registry import get_style_index, get_style_packs, preload_style_packs, style_file_name
+
+# Bulk styling of prompt datasets with the same rendering code as the nodes:
+#
+#   python -m ComfyUi_PromptStylers --style mood/Calm --style artists/Bob\ Ross prompts.jsonl > styled.jsonl
+#
+# Input is read and written in chunks, so memory stays constant however long the input is.
+
+CHUNK_SIZE = 1000
+
+
+def read_records(stream, input_format, prompt_field):
+    # Yield input records as dicts, one at a time
+    if input_format == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    elif input_format == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            # Also CRLF lines piped in on stdin, which keeps line endings as they are
+            line = line.rstrip('\r\n')
+            if line:
+                yield {prompt_field: line}
+
+
+def style_records(records, style_pairs, stack, prompt_field, negative_field):
+    # One output record per input record and style, or per input record when stacking
+    output = []
+    for record in records:
+        positive = record.get(prompt_field) or ""
+        negative = record.get(negative_field) or ""
+
+        if stack:
+            results = [("+".join(f"{pack}/{style}" for pack, style in style_pairs), read_sdxl_templates_stack(style_pairs, positive, negative))]
+        else:
+            results = [(f"{pack}/{style}", read_sdxl_templates_replace_and_combine(get_style_index(style_file_name(pack)), style, positive, negative))
+                       for pack, style in style_pairs]
+
+        for style, result in results:
+            if result is None:
+                raise ValueError(f"Could not apply style '{style}'.")
+            output.append(dict(record, style=style, styled_prompt=result[0], styled_negative_prompt=result[1]))
+    return output
+
+
+def _style_chunk(args):
+    # Serialized in the worker, the parent only writes the lines out
+    return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in style_records(*args))
+
+
+def _init_worker():
+    # Every worker maps the same compiled store, its pages are shared between them
+    preload_style_packs()
+
+
+def detect_format(path, input_format):
+    if input_format != 'auto':
+        return input_format
+    extension = os.path.splitext(path)[1].lower()
+    return {'.csv': 'csv', '.txt': 'text'}.get(extension, 'jsonl')
+
+
+def iter_input(paths, input_format, prompt_field):
+    for path in paths:
+        if path == '-':
+            yield from read_records(sys.stdin, 'jsonl' if input_format == 'auto' else input_format, prompt_field)
+        else:
+            file_format = detect_format(path, input_format)
+            # The csv module handles line endings itself, quoted fields may span lines
+            with open(path, 'r', encoding='utf8', newline='' if file_format == 'csv' else None) as stream:
+                yield from read_records(stream, file_format, prompt_field)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply prompt styles to a stream of prompts and write JSON Lines.")
+    parser.add_argument('inputs', nargs='*', default=['-'], help="JSONL, CSV or text files, '-' for stdin (default)")
+    parser.add_argument('--style', action='append', required=True, help="pack/style to apply, may be repeated")
+    parser.add_argument('--stack', action='store_true', help="stack the styles in order instead of applying each one separately")
+    parser.add_argument('--format', dest='input_format', choices=['auto', 'jsonl', 'csv', 'text'], default='auto')
+    parser.add_argument('--prompt-field', default='prompt')
+    parser.add_argument('--negative-field', default='negative_prompt')
+    parser.add_argument('--output', '-o', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (default 1)")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else io.open(args.output, 'w', encoding='utf8')
+    # Load messages go to stderr so they never end up in the JSON Lines output
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            run(parser, args, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run(parser, args, output):
+    style_pairs = parse_style_pairs('\n'.join(args.style))
+    # Build or open the compiled store once before any worker starts
+    preload_style_packs()
+    try:
+        style_pairs = resolve_style_pairs(style_pairs, get_style_packs({pack for pack, _ in style_pairs}))
+    except ValueError as e:
+        parser.error(str(e))
+
+    records = iter_input(args.inputs, args.input_format, args.prompt_field)
+    pool = multiprocessing.Pool(args.workers, initializer=_init_worker) if args.workers > 1 else None
+
+    count = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            # Bounded read-ahead: one chunk per worker at a time
+            chunks = [list(itertools.islice(records, CHUNK_SIZE)) for _ in range(max(args.workers, 1))]
+            chunks = [chunk for chunk in chunks if chunk]
+            if not chunks:
+                break
+
+            jobs = [(chunk, style_pairs, args.stack, args.prompt_field, args.negative_field) for chunk in chunks]
+            for lines in (pool.map(_style_chunk, jobs) if pool is not None else map(_style_chunk, jobs)):
+                output.write(lines)
+            count += sum(len(chunk) for chunk in chunks)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - start
+    print(f"{count} prompts in {elapsed:.2f} s ({count / elapsed if elapsed else 0:.0f} prompts/sec)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import sqlite3
+import sys
+
+from .style_backends import BACKENDS, convert_style_pack
+
+# Converts a pack between the formats of style_backends:
+#
+#   python -m ComfyUi_PromptStylers.style_convert sdxl_styles_mine.json mine.sqlite
+#
+# Kept out of style_backends, which the package has already imported when python -m
+# runs a module of it.
+
+
+def main(argv=None):
+    formats = {backend.name: backend for backend in BACKENDS}
+    parser = argparse.ArgumentParser(description="Convert a style pack between the JSON, JSON Lines, CSV and SQLite formats.")
+    parser.add_argument('source', help="pack to read, its format is taken from the extension")
+    parser.add_argument('target', help="file to write, replaced if it exists")
+    parser.add_argument('--format', choices=sorted(formats), help="format of the target (default: from its extension)")
+    args = parser.parse_args(argv)
+
+    try:
+        count = convert_style_pack(args.source, args.target, formats.get(args.format))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"An error occurred: {str(e)}")
+        return 1
+
+    print(f"{args.source}: {count} style(s) written to {args.target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import os
+import re
+
+from .style_backends import PACK_EXTENSIONS
+
+# Extra style pack directories, so in-house libraries do not have to be copied next to
+# the bundled packs:
+#
+#   PROMPT_STYLERS_PACK_DIRS=studio=/srv/styles:/home/me/styles     (';' on Windows)
+#
+# Inside ComfyUI the prompt_styles folders under models/ and user/ are scanned too.
+#
+# Every pack file below a directory, subfolders included and in any format of
+# style_backends, becomes a pack named <namespace>.<path>: the namespace is the label
+# before '=' (the directory's own name when there is none, 'models' and 'user' for the
+# ComfyUI folders), the path is the file's relative path with '.' between folders and
+# without the sdxl_styles_ prefix and the extension.
+# /srv/styles/portraits/sdxl_styles_light.json is 'studio.portraits.light'.
+#
+# Collision rules: bundled pack names have no '.' and so never collide with these.
+# When two files map to the same name, the directory listed first wins, within one
+# directory the file whose path sorts first; the other file is reported and skipped.
+PACK_DIRS = os.environ.get('PROMPT_STYLERS_PACK_DIRS', '')
+
+# Characters with a meaning in "pack/style" lines and "pack:weight" lists
+_RESERVED = re.compile(r'[/,:\s]+')
+
+
+def comfyui_style_dirs():
+    # ComfyUI's folder_paths only exists inside ComfyUI
+    try:
+        import folder_paths
+    except ImportError:
+        return []
+
+    dirs = []
+    models_dir = getattr(folder_paths, 'models_dir', None)
+    if models_dir:
+        dirs.append(('models', os.path.join(models_dir, 'prompt_styles')))
+    get_user_directory = getattr(folder_paths, 'get_user_directory', None)
+    if get_user_directory is not None:
+        dirs.append(('user', os.path.join(get_user_directory(), 'prompt_styles')))
+    return dirs
+
+
+def style_pack_dirs():
+    # (namespace, directory) of every extra pack directory, in priority order
+    dirs = []
+    for entry in PACK_DIRS.split(os.pathsep):
+        if not entry.strip():
+            continue
+        namespace, separator, directory = entry.partition('=')
+        if not separator:
+            namespace, directory = '', entry
+        directory = os.path.abspath(os.path.expanduser(directory.strip()))
+        dirs.append((namespace.strip() or os.path.basename(directory), directory))
+    return dirs + comfyui_style_dirs()
+
+
+def user_pack_name(namespace, directory, path):
+    parts = os.path.relpath(path, directory).split(os.sep)
+    stem = os.path.splitext(parts[-1])[0]
+    parts[-1] = stem[len('sdxl_styles_'):] if stem.startswith('sdxl_styles_') else stem
+    return '.'.join(_RESERVED.sub('_', part) for part in [namespace] + parts)
+
+
+def _pack_files(directory):
+    # Pack files below directory in sorted path order, hidden folders are skipped
+    files = []
+    for root, folders, names in os.walk(directory):
+        folders[:] = sorted(folder for folder in folders if not folder.startswith('.'))
+        files.extend(os.path.join(root, name) for name in names
+                     if name.endswith(PACK_EXTENSIONS) and not name.startswith('.'))
+    return sorted(files)
+
+
+def scan_style_dirs(dirs=None):
+    # {pack name: file path} of every pack in the extra directories, and the
+    # (skipped path, pack name, winning path) of every collision
+    packs = {}
+    skipped = []
+    for namespace, directory in style_pack_dirs() if dirs is None else dirs:
+        if not os.path.isdir(directory):
+            continue
+        for path in _pack_files(directory):
+            pack = user_pack_name(namespace, directory, path)
+            if pack in packs:
+                skipped.append((path, pack, packs[pack]))
+            else:
+                packs[pack] = path
+    return packs, skipped
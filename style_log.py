@@ -0,0 +1,197 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+# Structured logging of styled prompts. The styler nodes only put a record on a queue;
+# a background listener formats each record as one JSON line and writes it to the
+# sinks, so a busy queue of prompts never waits on the console or a log file.
+#
+#   PROMPT_STYLERS_LOG_LEVEL      level of the prompt_stylers logger, styling records are INFO
+#   PROMPT_STYLERS_LOG_CONSOLE    0 to stop writing records to stdout
+#   PROMPT_STYLERS_LOG_FILE       also write records to this file, rotated by size
+#   PROMPT_STYLERS_LOG_MAX_BYTES  size of one log file before it is rotated
+#   PROMPT_STYLERS_LOG_BACKUPS    rotated files that are kept
+#   PROMPT_STYLERS_LOG_RATE       records per second, the rest are dropped and counted
+#   PROMPT_STYLERS_LOG_TEXT       0 to log only lengths instead of the full prompt text
+LOG_LEVEL = os.environ.get('PROMPT_STYLERS_LOG_LEVEL', 'INFO').upper()
+LOG_CONSOLE = os.environ.get('PROMPT_STYLERS_LOG_CONSOLE', '1') != '0'
+LOG_FILE = os.environ.get('PROMPT_STYLERS_LOG_FILE', '')
+LOG_MAX_BYTES = int(os.environ.get('PROMPT_STYLERS_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUPS = int(os.environ.get('PROMPT_STYLERS_LOG_BACKUPS', '3'))
+LOG_RATE = float(os.environ.get('PROMPT_STYLERS_LOG_RATE', '50'))
+LOG_TEXT = os.environ.get('PROMPT_STYLERS_LOG_TEXT', '1') != '0'
+
+logger = logging.getLogger('prompt_stylers')
+# Records go to our own sinks only, not to whatever ComfyUI set up on the root logger
+logger.propagate = False
+logger.setLevel(LOG_LEVEL)
+
+_listener = None
+_listener_lock = threading.RLock()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per line: time, level, then the fields of the record
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+        }
+        fields = getattr(record, 'fields', None)
+        if fields is not None:
+            entry.update(fields)
+        else:
+            entry['message'] = record.getMessage()
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    # Token bucket: bursts of up to `rate` records, then `rate` records per second.
+    # Dropped records are counted and the count is added to the next record let through.
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.rate <= 0:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                self._dropped += 1
+                return False
+            self._tokens -= 1
+            dropped, self._dropped = self._dropped, 0
+
+        if dropped and getattr(record, 'fields', None) is not None:
+            record.fields['dropped'] = dropped
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock handler formats the message on the calling thread; records stay in this
+    # process, so formatting is left to the listener thread
+
+    def prepare(self, record):
+        return record
+
+
+def default_log_handlers():
+    handlers = []
+    if LOG_CONSOLE:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    if LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf8'))
+    return handlers
+
+
+def configure_logging(handlers=None, rate=LOG_RATE, level=None):
+    # (Re)start the listener with the given sinks, by default the ones from the
+    # environment. Handlers without a formatter write JSON lines.
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        if level is not None:
+            logger.setLevel(level)
+
+        handlers = default_log_handlers() if handlers is None else list(handlers)
+        for handler in handlers:
+            if handler.formatter is None:
+                handler.setFormatter(JsonLinesFormatter())
+
+        records = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(records)
+        queue_handler.addFilter(RateLimitFilter(rate))
+        logger.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def stop_logging():
+    # Write out everything still queued, called at exit
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def set_log_level(level):
+    logger.setLevel(level)
+
+
+def _ensure_listener():
+    if _listener is None:
+        with _listener_lock:
+            if _listener is None:
+                configure_logging()
+
+
+def log_styling(node, style, text_positive, text_negative, positive_prompt, negative_prompt, elapsed, **fields):
+    # One record per styled prompt. Cheap when the level filters it out.
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    _ensure_listener()
+
+    record = {
+        'event': 'styled',
+        'node': node,
+        'style': style,
+        'text_positive_len': len(text_positive),
+        'text_negative_len': len(text_negative),
+        'positive_len': len(positive_prompt) if positive_prompt is not None else None,
+        'negative_len': len(negative_prompt) if negative_prompt is not None else None,
+        'ms': round(elapsed * 1000, 3),
+    }
+    record.update(fields)
+    if LOG_TEXT:
+        record.update(text_positive=text_positive, text_negative=text_negative,
+                      positive_prompt=positive_prompt, negative_prompt=negative_prompt)
+
+    logger.info("styled", extra={'fields': record})
+
+
+def log_token_limit(node, prompt, tokens, budget, truncated_to=None):
+    # A prompt over the CLIP token budget, reported or truncated by the token_limit
+    # input of a node
+    if not logger.isEnabledFor(logging.WARNING):
+        return
+    _ensure_listener()
+
+    record = {
+        'event': 'token_limit',
+        'node': node,
+        'prompt': prompt,
+        'tokens': tokens,
+        'budget': budget,
+    }
+    if truncated_to is not None:
+        record['truncated_to'] = truncated_to
+
+    logger.warning("token_limit", extra={'fields': record})
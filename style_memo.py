@@ -0,0 +1,69 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .style_metrics import add_metrics_source
+
+# Number of styled prompts remembered by the styler nodes, 0 disables memoization
+MEMO_SIZE = int(os.environ.get('PROMPT_STYLERS_MEMO_SIZE', '1024'))
+
+
+class LRUCache:
+    # Bounded, thread-safe least-recently-used cache with hit/miss counters. Lookups
+    # take no lock, only insertions do.
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        # Each OrderedDict call is atomic; an entry evicted between the lookup and the
+        # move is a miss. Under heavy concurrency the counters are approximate.
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Styled (positive, negative) prompts keyed by pack, pack signature, style and texts
+styled_prompt_cache = LRUCache(MEMO_SIZE)
+add_metrics_source('styled_prompt_cache', styled_prompt_cache.stats)
@@ -0,0 +1,156 @@
+import functools
+import os
+import sys
+import threading
+from time import perf_counter
+
+# Built-in instrumentation: call counts and latencies of pack loading, index building,
+# INPUT_TYPES and prompt_styler, plus whatever other modules report through
+# add_metrics_source (cache hit ratios, per-pack memory). Read it with
+# metrics_snapshot() or GET /prompt_stylers/metrics. Set PROMPT_STYLERS_METRICS=0 to
+# turn the timers off.
+METRICS_ENABLED = os.environ.get('PROMPT_STYLERS_METRICS', '1') != '0'
+
+# Percentiles are computed over the most recent samples of each timer
+SAMPLE_WINDOW = 1024
+
+_timers = {}
+_timers_lock = threading.Lock()
+_sources = {}
+
+
+class LatencyTimer:
+    # Count, total, min and max since start, percentiles over a ring of recent samples
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self._samples = [0.0] * SAMPLE_WINDOW
+        self._lock = threading.Lock()
+
+    def record(self, elapsed):
+        with self._lock:
+            self._samples[self.count % SAMPLE_WINDOW] = elapsed
+            self.count += 1
+            self.total += elapsed
+            if elapsed < self.min:
+                self.min = elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+
+    def stats(self):
+        with self._lock:
+            count, total, low, high = self.count, self.total, self.min, self.max
+            samples = sorted(self._samples[:min(count, SAMPLE_WINDOW)])
+
+        def percentile(p):
+            return samples[min(int(p * len(samples)), len(samples) - 1)] * 1000 if samples else None
+
+        return {
+            'count': count,
+            'total_ms': total * 1000,
+            'mean_ms': total * 1000 / count if count else None,
+            'min_ms': low * 1000 if count else None,
+            'max_ms': high * 1000 if count else None,
+            'p50_ms': percentile(0.5),
+            'p90_ms': percentile(0.9),
+            'p99_ms': percentile(0.99),
+        }
+
+
+def get_timer(name, label=None):
+    key = (name, label)
+    timer = _timers.get(key)
+    if timer is None:
+        with _timers_lock:
+            timer = _timers.setdefault(key, LatencyTimer())
+    return timer
+
+
+def record_timing(name, label, elapsed):
+    if METRICS_ENABLED:
+        get_timer(name, label).record(elapsed)
+
+
+class timed:
+    # with timed('pack_load', file_name): ...
+
+    __slots__ = ('name', 'label', 'start')
+
+    def __init__(self, name, label=None):
+        self.name = name
+        self.label = label
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_timing(self.name, self.label, perf_counter() - self.start)
+
+
+def timed_method(name):
+    # Times a node method, labelled with the node class; works below @classmethod too
+    def decorate(function):
+        if not METRICS_ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                node = self if isinstance(self, type) else type(self)
+                timer = _timers.get((name, node.__name__)) or get_timer(name, node.__name__)
+                timer.record(elapsed)
+        return wrapper
+    return decorate
+
+
+def add_metrics_source(name, function):
+    # function() returns a JSON-serializable value that is included in every snapshot
+    _sources[name] = function
+
+
+def metrics_snapshot():
+    # {'timings': {name: {label: stats}}, <source>: ...}
+    timings = {}
+    for (name, label), timer in sorted(_timers.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        timings.setdefault(name, {})['*' if label is None else label] = timer.stats()
+
+    snapshot = {'enabled': METRICS_ENABLED, 'timings': timings}
+    for name, function in list(_sources.items()):
+        try:
+            snapshot[name] = function()
+        except Exception as e:
+            snapshot[name] = {'error': str(e)}
+    return snapshot
+
+
+def reset_metrics():
+    with _timers_lock:
+        _timers.clear()
+
+
+def deep_sizeof(*objects):
+    # Approximate memory held by the given objects and the containers and strings
+    # they reference, every object counted once
+    seen = set()
+    size = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
@@ -0,0 +1,633 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from .style_backends import pack_backend
+from .style_cache import CACHE_ENABLED, cache_file_path, load_name_index, open_style_cache, save_name_index, save_style_cache
+from .style_dirs import scan_style_dirs
+from .style_metrics import add_metrics_source, deep_sizeof, timed
+from .style_schema import iter_style_records, read_style_records, reset_shared_text, validate_style_pack
+from .style_stream import iter_pack_entries
+from .style_template import StyleTemplate
+from .style_tokens import template_token_counts
+
+# Directory holding the bundled sdxl_styles_*.json packs
+STYLES_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Seconds between two on-disk change checks of a loaded pack. 0 checks on every
+# access, a negative value disables hot reloading.
+RELOAD_INTERVAL = float(os.environ.get('PROMPT_STYLERS_RELOAD_INTERVAL', '2'))
+# Also compare a content hash, so a file that was only touched is not re-parsed
+RELOAD_HASH = os.environ.get('PROMPT_STYLERS_RELOAD_HASH', '0') == '1'
+# Serve style names from the names-only sidecar index and load a pack's templates only
+# when a workflow executes one of its nodes, instead of loading every pack up front
+LAZY_LOADING = os.environ.get('PROMPT_STYLERS_LAZY', '0') == '1'
+# Seconds between two scans of the extra pack directories (see style_dirs) when the
+# pack list is asked for. A negative value scans only on first use and on rescan.
+RESCAN_INTERVAL = float(os.environ.get('PROMPT_STYLERS_RESCAN_INTERVAL', '10'))
+
+# Parsed style packs keyed by absolute file path. Every pack is parsed once per
+# process and then shared by all node classes that reference it.
+# The mapping is never modified in place: writers hold _packs_lock, build a new dict and
+# publish it with a single assignment. Readers take no lock, they look up the dict they
+# find and get a complete, immutable pack from it.
+_packs = {}
+_packs_lock = threading.Lock()
+# Reload bookkeeping, kept out of the shared packs: time of the last on-disk check and
+# the stat signature of a file that was touched without being edited
+_checked_at = {}
+_seen_signatures = {}
+_preloaded = False
+# Lazy mode state: the sidecar name index and the mapped store, opened on first use
+_name_index = None
+_lazy_store = None
+# (text bytes, stored bytes) of the store the packs were served from
+_store_sizes = None
+# Packs of the extra directories, {pack name: file path}, published whole like _packs
+# and None until the first scan; their files are parsed on first use. The stat
+# signature of every file at the last scan tells a rescan which ones changed.
+_user_packs = None
+_user_signatures = {}
+_user_skipped = set()
+_scanned_at = 0.0
+
+
+def read_json_file(file_path):
+    try:
+        # JSON Lines packs are read entry by entry
+        if file_path.endswith('.jsonl'):
+            return list(iter_pack_entries(file_path))
+        # Open file, load JSON content into python dictionary, and return it.
+        with open(file_path, 'r', encoding="utf8", errors='ignore') as file:
+            json_data = json.load(file)
+            return json_data
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+
+
+def read_sdxl_styles(json_data):
+    # Check that data is a list
+    if not isinstance(json_data, list):
+        print("Error: input data must be a list")
+        return None
+
+    names = []
+
+    # Iterate over each item in the data list
+    for item in json_data:
+        # Check that the item is a dictionary
+        if isinstance(item, dict):
+            # Check that 'name' is a key in the dictionary
+            if 'name' in item:
+                # Append the value of 'name' to the names list
+                names.append(item['name'])
+
+    return names
+
+
+def index_style_records(records):
+    # Map each style name to its compiled template so styling a prompt is a single
+    # dict lookup followed by a join.
+    # When a name is defined more than once the first definition wins, which is the
+    # template the old linear scan returned.
+    index = {}
+
+    for record in records:
+        if record.name not in index:
+            index[record.name] = StyleTemplate(*record)
+
+    return index
+
+
+def build_style_index(json_data):
+    # Index of a raw template list; invalid entries are dropped without a report
+    return index_style_records(validate_style_pack(json_data)[0])
+
+
+def find_style_template(json_data, template_name):
+    # Template of one style of a raw template list, None when there is none. Same rule
+    # as build_style_index, the first valid definition wins, but only the entries with
+    # that name are validated and compiled: callers passing a list style a prompt
+    # without indexing the whole pack.
+    for entry in json_data:
+        if isinstance(entry, dict) and entry.get('name') == template_name:
+            for record in iter_style_records((entry,), [], []):
+                return StyleTemplate(*record)
+    return None
+
+
+def file_signature(file_path, with_hash=False):
+    # Cheap change detector for a pack file: (mtime, size, content hash or None)
+    stat = os.stat(file_path)
+    digest = None
+    if with_hash:
+        with open(file_path, 'rb') as file:
+            digest = hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+    return (stat.st_mtime_ns, stat.st_size, digest)
+
+
+class StylePack:
+
+    def __init__(self, file_path, records, signature=None):
+        self.file_path = file_path
+        self.signature = signature
+
+        if hasattr(records, 'build_index'):
+            # Templates stay in the memory-mapped store or the SQLite file until a
+            # style is selected
+            self._mapped = records
+            self._records = None
+            with timed('index_build', os.path.basename(file_path)):
+                self.index = records.build_index()
+            self._without_placeholder = None
+        else:
+            # Validated StyleRecords, see style_schema
+            self._mapped = None
+            self._records = records or []
+            with timed('index_build', os.path.basename(file_path)):
+                self.index = index_style_records(self._records)
+
+            duplicates = len(self._records) - len(self.index)
+            if duplicates:
+                print(f"{os.path.basename(file_path)}: {duplicates} duplicate style name(s) ignored, first definition wins")
+
+            # Flagged at compile time: the positive text is dropped for these styles
+            self._without_placeholder = [name for name, template in self.index.items() if template.placeholders == 0]
+            if self._without_placeholder:
+                print(f"{os.path.basename(file_path)}: {len(self._without_placeholder)} style(s) without a {{prompt}} placeholder ignore the positive text")
+
+        # Duplicate names are unreachable, so the dropdown lists every name once
+        self.names = list(self.index)
+        self._token_counts = {}
+
+    @property
+    def json_data(self):
+        # Normalized template list; mapped packs are decoded in full only when asked for
+        if self._mapped is not None:
+            return self._mapped.templates()
+        return [record._asdict() for record in self._records]
+
+    def memory_size(self):
+        # Bytes held by the pack's Python objects. Mapped packs count only what was
+        # decoded so far, the store itself is made of shared file pages.
+        if self._mapped is not None:
+            return deep_sizeof(self.names, self.index._ids, self.index._templates)
+        return deep_sizeof(self.names, self.index, self._records)
+
+    def token_counts(self, name):
+        # (CLIP tokens of the prompt around its placeholders, of the negative prompt)
+        # of a style: precomputed in the compiled store, counted on first use otherwise
+        if self._mapped is not None and hasattr(self._mapped, 'token_counts'):
+            counts = self._mapped.token_counts(self.index, name)
+            if counts is not None:
+                return counts
+        counts = self._token_counts.get(name)
+        if counts is None:
+            counts = self._token_counts[name] = template_token_counts(self.index[name])
+        return counts
+
+    @property
+    def without_placeholder(self):
+        # Names of the styles that ignore the positive text, read lazily from the store
+        if self._without_placeholder is None:
+            self._without_placeholder = self._mapped.names_without_placeholder(self.index)
+        return self._without_placeholder
+
+
+def _open_lazy_store():
+    global _lazy_store
+    if _lazy_store is None and CACHE_ENABLED:
+        _lazy_store = open_style_cache()
+    return _lazy_store
+
+
+def load_style_pack(file_path):
+    with timed('pack_load', os.path.basename(file_path)):
+        return _load_style_pack(file_path)
+
+
+def _load_style_pack(file_path):
+    # Stat before reading: if the file changes in between, the next check reloads it again
+    try:
+        signature = file_signature(file_path, RELOAD_HASH)
+    except OSError:
+        signature = None
+
+    # In lazy mode a pack that is still fresh in the mapped store is served from it
+    if LAZY_LOADING and signature is not None and os.path.dirname(file_path) == STYLES_DIR:
+        file_name = os.path.basename(file_path)
+        store = _open_lazy_store()
+        if store is not None and store.signature(file_name) == signature[:2]:
+            return StylePack(file_path, store.pack(file_name), signature)
+
+    # Validated once here, large packs streamed; the styling path never checks a template
+    # again. SQLite packs are opened instead and queried per style.
+    records = pack_backend(file_path).load(file_path)
+    if records is None:
+        return None
+    return StylePack(file_path, records, signature)
+
+
+def style_pack_changed(pack):
+    # Compare the pack's signature against the file on disk
+    try:
+        signature = file_signature(pack.file_path)
+    except OSError:
+        # The file was removed or is being replaced, keep serving what we have
+        return False
+
+    known = _seen_signatures.get(pack.file_path, pack.signature)
+    if known is None or signature[:2] == known[:2]:
+        return False
+
+    if RELOAD_HASH:
+        signature = file_signature(pack.file_path, True)
+        if signature[2] == pack.signature[2]:
+            # Touched but not edited, remember the new stat so we don't hash it again
+            _seen_signatures[pack.file_path] = signature
+            return False
+
+    return True
+
+
+def _reload_due(file_path):
+    if RELOAD_INTERVAL < 0:
+        return False
+
+    now = time.monotonic()
+    if now - _checked_at.get(file_path, 0.0) < RELOAD_INTERVAL:
+        return False
+
+    _checked_at[file_path] = now
+    return True
+
+
+def _publish_style_packs(packs):
+    # Called with _packs_lock held: replace the whole mapping in one assignment
+    global _packs
+    for file_path, pack in packs.items():
+        if _packs.get(file_path) is not pack:
+            _checked_at[file_path] = time.monotonic()
+            _seen_signatures.pop(file_path, None)
+    _packs = packs
+    # The published packs hold their text now, the next load gets a new table
+    reset_shared_text()
+
+
+def _swap_in_style_pack(file_path, stale_pack):
+    with _packs_lock:
+        # Another thread may have (re)loaded the pack while we were waiting
+        current = _packs.get(file_path)
+        if current is not stale_pack:
+            return current
+
+        pack = load_style_pack(file_path)
+        if pack is None:
+            if current is None:
+                # Failed reads are not cached so a fixed file is picked up on the next call
+                return StylePack(file_path, None)
+            # Keep serving the last good pack until the file changes again
+            try:
+                _seen_signatures[file_path] = file_signature(file_path, RELOAD_HASH)
+            except OSError:
+                pass
+            return current
+
+        # The pack is fully built before it is published, readers see either the old
+        # or the new pack but never a partially loaded one
+        _publish_style_packs(dict(_packs, **{file_path: pack}))
+        return pack
+
+
+def list_style_files(directory=None):
+    # Bundled packs follow the sdxl_styles_<name>.json naming scheme
+    return sorted(f for f in os.listdir(directory or STYLES_DIR) if f.startswith('sdxl_styles_') and f.endswith('.json'))
+
+
+def list_style_packs():
+    # Short pack names, e.g. 'misc' for sdxl_styles_misc.json, followed by the
+    # namespaced packs of the extra directories, e.g. 'studio.portraits'
+    return [style_pack_name(f) for f in list_style_files()] + sorted(user_style_packs(rescan=True))
+
+
+def style_file_name(pack):
+    # File name of a bundled pack, absolute path of a pack from an extra directory.
+    # Either one can be passed to get_style_pack. Only user packs have a '.' in the name.
+    if '.' in pack:
+        file_path = user_style_packs().get(pack)
+        if file_path is not None:
+            return file_path
+    return f"sdxl_styles_{pack}.json"
+
+
+def style_pack_name(file_name):
+    if os.path.isabs(file_name):
+        for pack, file_path in user_style_packs().items():
+            if file_path == file_name:
+                return pack
+    return file_name[len('sdxl_styles_'):-len('.json')]
+
+
+def user_style_packs(rescan=False):
+    # {pack name: file path} of the extra directories, scanned on first use and, with
+    # rescan, again once RESCAN_INTERVAL has passed
+    if _user_packs is None or (rescan and 0 <= RESCAN_INTERVAL <= time.monotonic() - _scanned_at):
+        rescan_style_packs()
+    return _user_packs
+
+
+def rescan_style_packs():
+    # Scan the extra directories again. Only packs whose file is new, changed or gone
+    # are touched: loaded packs that changed are re-indexed right away, new ones are
+    # parsed on first use and unchanged ones keep their index.
+    # Returns the (added, changed, removed) pack names.
+    global _user_packs, _user_signatures, _scanned_at
+
+    with _packs_lock:
+        found, skipped = scan_style_dirs()
+        for file_path, pack, winner in skipped:
+            if file_path not in _user_skipped:
+                print(f"Style pack {file_path} skipped: {pack} is already defined by {winner}")
+        _user_skipped.clear()
+        _user_skipped.update(file_path for file_path, _, _ in skipped)
+
+        signatures = {}
+        for pack, file_path in list(found.items()):
+            try:
+                signatures[file_path] = file_signature(file_path)[:2]
+            except OSError:
+                del found[pack]
+
+        known = _user_packs or {}
+        added = sorted(pack for pack in found if pack not in known)
+        removed = sorted(pack for pack in known if pack not in found)
+        changed = sorted(pack for pack in found if pack in known and
+                         (known[pack] != found[pack] or _user_signatures.get(found[pack]) != signatures[found[pack]]))
+
+        # A loaded pack that was hot-reloaded since the last scan is already current
+        stale = {known[pack] for pack in removed + changed}
+        stale -= {found[pack] for pack in changed if found[pack] in _packs and
+                  (_packs[found[pack]].signature or ())[:2] == signatures[found[pack]]}
+        if stale:
+            packs = {file_path: pack for file_path, pack in _packs.items() if file_path not in stale}
+            for pack in changed:
+                if known[pack] in stale and known[pack] in _packs:
+                    loaded = load_style_pack(found[pack])
+                    if loaded is not None:
+                        packs[found[pack]] = loaded
+            for file_path in stale:
+                _checked_at.pop(file_path, None)
+                _seen_signatures.pop(file_path, None)
+            _publish_style_packs(packs)
+
+        if _user_packs is not None and (added or changed or removed):
+            print(f"Style packs rescanned: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+
+        _user_signatures = signatures
+        _user_packs = found
+        _scanned_at = time.monotonic()
+
+    return added, changed, removed
+
+
+def preload_style_packs():
+    # Build-or-load step run once per process: every bundled pack is served from the
+    # memory-mapped store and only packs whose file changed since the store was
+    # written are parsed from JSON. The store is rebuilt when anything was stale.
+    global _preloaded, _name_index, _store_sizes
+
+    with _packs_lock, timed('preload'):
+        if _preloaded:
+            return
+
+        signatures = {}
+        for file_name in list_style_files():
+            try:
+                signatures[file_name] = file_signature(os.path.join(STYLES_DIR, file_name), RELOAD_HASH)
+            except OSError:
+                continue
+
+        store = open_style_cache() if CACHE_ENABLED else None
+        sources = {}
+
+        if store is None or len(store.packs) != len(signatures) or \
+                any(store.signature(f) != signature[:2] for f, signature in signatures.items()):
+            for file_name, signature in signatures.items():
+                if store is not None and store.signature(file_name) == signature[:2]:
+                    # Records in the store were validated when it was written
+                    sources[file_name] = list(store.pack(file_name).records())
+                else:
+                    records = read_style_records(os.path.join(STYLES_DIR, file_name))
+                    if records is not None:
+                        sources[file_name] = records
+
+            # Drop the old mapping before its file is replaced
+            store = None
+            if CACHE_ENABLED:
+                save_style_cache({f: (signatures[f][:2], records) for f, records in sources.items()})
+                store = open_style_cache()
+                if store is not None:
+                    print(f"Compiled style store: {store.text_bytes / 2**20:.2f} MiB of style text stored in "
+                          f"{store.blob_bytes / 2**20:.2f} MiB, shared by all packs and worker processes")
+
+        _store_sizes = (store.text_bytes, store.blob_bytes) if store is not None else None
+
+        packs = dict(_packs)
+        for file_name, signature in signatures.items():
+            file_path = os.path.join(STYLES_DIR, file_name)
+            # Packs loaded before the preload (or reloaded since) are kept as they are
+            if file_path in packs:
+                continue
+
+            if store is not None and store.signature(file_name) == signature[:2]:
+                packs[file_path] = StylePack(file_path, store.pack(file_name), signature)
+            elif file_name in sources:
+                packs[file_path] = StylePack(file_path, sources[file_name], signature)
+        _publish_style_packs(packs)
+
+        # Keep the names-only sidecar in step with the store for the lazy mode
+        if CACHE_ENABLED and (sources or (LAZY_LOADING and any(_sidecar_names(f) is None for f in signatures))):
+            _name_index = {f: {'signature': list(signature[:2]), 'names': packs[os.path.join(STYLES_DIR, f)].names}
+                           for f, signature in signatures.items() if os.path.join(STYLES_DIR, f) in packs}
+            save_name_index(_name_index)
+
+        _preloaded = True
+
+
+def _sidecar_names(file_name):
+    # Style names of a pack from the sidecar index, None when missing or stale
+    global _name_index
+    if _name_index is None:
+        _name_index = load_name_index() if CACHE_ENABLED else {}
+
+    entry = _name_index.get(file_name)
+    if not isinstance(entry, dict):
+        return None
+
+    try:
+        signature = file_signature(os.path.join(STYLES_DIR, file_name))
+    except OSError:
+        return None
+
+    return entry.get('names') if entry.get('signature') == list(signature[:2]) else None
+
+
+def clear_style_registry():
+    # Forget every loaded pack, the next access runs the preload again
+    global _preloaded, _name_index, _lazy_store, _store_sizes, _user_packs, _user_signatures
+
+    with _packs_lock:
+        _publish_style_packs({})
+        _checked_at.clear()
+        _seen_signatures.clear()
+        _preloaded = False
+        _name_index = None
+        _lazy_store = None
+        _store_sizes = None
+        _user_packs = None
+        _user_signatures = {}
+        _user_skipped.clear()
+
+
+def get_style_pack(file_name):
+    # file_name is relative to STYLES_DIR; the absolute path of a pack from an extra
+    # directory is used as it is.
+    # In lazy mode only the requested pack is loaded, unless the sidecar index does not
+    # know it yet; the full preload then rebuilds both the store and the sidecar
+    file_path = os.path.join(STYLES_DIR, file_name)
+
+    # Fast path, lock free: the pack has already been parsed and is unchanged on disk.
+    # A loaded pack was resolved before, by the preload or lazily, so the sidecar is
+    # not consulted again.
+    pack = _packs.get(file_path)
+    if pack is None and not _preloaded and os.path.dirname(file_path) == STYLES_DIR and \
+            not (LAZY_LOADING and _sidecar_names(file_name) is not None):
+        preload_style_packs()
+        pack = _packs.get(file_path)
+
+    if pack is not None and not (_reload_due(file_path) and style_pack_changed(pack)):
+        return pack
+
+    return _swap_in_style_pack(file_path, pack)
+
+
+def get_style_packs(packs):
+    # {pack name: StylePack}, one snapshot of every pack. A node that uses a pack more
+    # than once per call resolves it here once, so a reload in between can not mix
+    # two versions of the pack in one result.
+    return {pack: get_style_pack(style_file_name(pack)) for pack in packs}
+
+
+def reload_style_packs():
+    # Re-parse every loaded pack whose file changed on disk, ignoring RELOAD_INTERVAL.
+    # Returns the paths of the packs that were reloaded.
+    reloaded = []
+    for file_path, pack in _packs.items():
+        if style_pack_changed(pack) and _swap_in_style_pack(file_path, pack) is not pack:
+            reloaded.append(file_path)
+    return reloaded
+
+
+def get_style_names(file_name):
+    # Style names shown in the node's 'style' dropdown
+    if LAZY_LOADING and not _preloaded and os.path.join(STYLES_DIR, file_name) not in _packs:
+        names = _sidecar_names(file_name)
+        if names is not None:
+            return names
+    return get_style_pack(file_name).names
+
+
+def get_style_templates(file_name):
+    # Template list of the pack, with null and NaN fields normalized
+    return get_style_pack(file_name).json_data
+
+
+def get_style_index(file_name):
+    # Prebuilt name -> compiled template index of the pack
+    return get_style_pack(file_name).index
+
+
+def get_styles_without_placeholder(file_name):
+    # Styles whose prompt has no {prompt} placeholder and so ignore the positive text
+    return get_style_pack(file_name).without_placeholder
+
+
+def get_style_page(pack, offset=0, limit=100, contains=None, with_templates=False):
+    # One page of a pack's styles, optionally filtered by a case-insensitive substring
+    style_pack = get_style_pack(style_file_name(pack))
+    names = style_pack.names
+    if contains:
+        needle = contains.lower()
+        names = [name for name in names if needle in name.lower()]
+
+    page = names[offset:offset + limit]
+    if with_templates:
+        styles = [{'name': name, 'prompt': style_pack.index[name].prompt, 'negative_prompt': style_pack.index[name].negative_prompt}
+                  for name in page]
+    else:
+        styles = page
+
+    return {'pack': pack, 'total': len(names), 'offset': offset, 'limit': limit, 'styles': styles}
+
+
+def style_pack_metrics():
+    # Size and memory footprint of every loaded pack. Strings shared between packs
+    # are counted in each of them.
+    packs = {}
+    for file_path, pack in _packs.items():
+        packs[os.path.basename(file_path) if os.path.dirname(file_path) == STYLES_DIR else file_path] = {
+            'styles': len(pack.names),
+            'source': pack._mapped.source if pack._mapped is not None else 'json',
+            'memory_bytes': pack.memory_size(),
+        }
+
+    try:
+        store_bytes = os.path.getsize(cache_file_path()) if CACHE_ENABLED else 0
+    except OSError:
+        store_bytes = 0
+
+    return {'loaded': len(packs), 'store_bytes': store_bytes, 'packs': packs}
+
+
+add_metrics_source('packs', style_pack_metrics)
+
+
+def shared_text_metrics(packs):
+    # Sharing among the text of the given packs, measured now: every name, prompt,
+    # negative prompt and prompt segment of the templates built so far, against the
+    # distinct strings that hold them
+    seen = set()
+    strings = distinct = text_bytes = stored_bytes = 0
+    for pack in packs:
+        templates = pack.index._templates.values() if pack._mapped is not None else pack.index.values()
+        for template in templates:
+            texts = (template.name, template.prompt, template.negative_prompt)
+            if template.placeholders:
+                texts += template.segments
+            for text in texts:
+                size = sys.getsizeof(text)
+                strings += 1
+                text_bytes += size
+                if id(text) not in seen:
+                    seen.add(id(text))
+                    distinct += 1
+                    stored_bytes += size
+    return {'strings': strings, 'distinct': distinct, 'text_bytes': text_bytes,
+            'stored_bytes': stored_bytes, 'bytes_saved': text_bytes - stored_bytes}
+
+
+def string_sharing_metrics():
+    # Bytes saved by storing identical text once: in the compiled store on disk (and in
+    # the page cache shared by worker processes) and among the strings of the packs
+    # currently loaded in this process
+    metrics = {'shared': shared_text_metrics(list(_packs.values()))}
+    if _store_sizes is not None:
+        text_bytes, blob_bytes = _store_sizes
+        metrics['store'] = {'text_bytes': text_bytes, 'stored_bytes': blob_bytes, 'bytes_saved': text_bytes - blob_bytes}
+    return metrics
+
+
+add_metrics_source('strings', string_sharing_metrics)
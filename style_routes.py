@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+
+from .style_metrics import metrics_snapshot, reset_metrics
+from .style_registry import get_style_pack, get_style_page, list_style_packs, rescan_style_packs, style_file_name
+from .style_search import search_styles
+
+# HTTP routes on the ComfyUI server. Outside ComfyUI (CLI, benchmarks) there is no
+# server to register with and this module does nothing.
+try:
+    from aiohttp import web
+    from server import PromptServer
+except ImportError:
+    PromptServer = None
+
+
+def _query_packs(request):
+    packs = request.query.get('packs')
+    return {pack.strip() for pack in packs.split(',') if pack.strip()} if packs else None
+
+
+def _query_int(request, name, default, maximum):
+    try:
+        return max(0, min(int(request.query.get(name, default)), maximum))
+    except ValueError:
+        return default
+
+
+def _etag(*parts):
+    return '"' + hashlib.blake2b(repr(parts).encode('utf8'), digest_size=12).hexdigest() + '"'
+
+
+async def _cached_json(request, etag, build):
+    # Answer 304 when the browser already holds this exact response. build may load
+    # packs, it runs in the executor like every other blocking call of the routes.
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers=headers)
+    return web.json_response(await asyncio.get_running_loop().run_in_executor(None, build), headers=headers)
+
+
+def _pack_signatures():
+    # Every pack with its signature. The first call may preload all packs, compile the
+    # store and scan the extra pack directories.
+    packs = list_style_packs()
+    return packs, [get_style_pack(style_file_name(pack)).signature for pack in packs]
+
+
+def _pack_signature(pack):
+    # Signature of one pack, None when there is no such pack
+    if pack not in list_style_packs():
+        return None
+    return get_style_pack(style_file_name(pack)).signature
+
+
+if PromptServer is not None and getattr(PromptServer, 'instance', None) is not None:
+    routes = PromptServer.instance.routes
+
+    @routes.get('/prompt_stylers/search')
+    async def search_styles_route(request):
+        # GET /prompt_stylers/search?q=kraken&limit=20&packs=mc,horror
+        query = request.query.get('q', '')
+        limit = _query_int(request, 'limit', 20, 500)
+        packs = _query_packs(request)
+        # The first search builds the index, keep that off the event loop
+        results = await asyncio.get_running_loop().run_in_executor(None, search_styles, query, limit, packs)
+        return web.json_response({'query': query, 'results': results})
+
+    @routes.get('/prompt_stylers/packs')
+    async def list_packs_route(request):
+        # GET /prompt_stylers/packs: every pack with its number of styles
+        # The first request may load every pack, keep that off the event loop
+        packs, signatures = await asyncio.get_running_loop().run_in_executor(None, _pack_signatures)
+        return await _cached_json(request, _etag(packs, signatures), lambda: {
+            'packs': [{'pack': pack, 'count': len(get_style_pack(style_file_name(pack)).names)} for pack in packs],
+        })
+
+    @routes.get('/prompt_stylers/styles')
+    async def list_styles_route(request):
+        # GET /prompt_stylers/styles?pack=all&offset=0&limit=100&filter=gothic&templates=1
+        pack = request.query.get('pack', 'all')
+        signature = await asyncio.get_running_loop().run_in_executor(None, _pack_signature, pack)
+        if signature is None:
+            return web.json_response({'error': f"Unknown pack '{pack}'."}, status=404)
+
+        offset = _query_int(request, 'offset', 0, 10**9)
+        limit = _query_int(request, 'limit', 100, 1000)
+        contains = request.query.get('filter') or None
+        with_templates = request.query.get('templates', '0') == '1'
+
+        etag = _etag(pack, signature, offset, limit, contains, with_templates)
+        return await _cached_json(request, etag, lambda: get_style_page(pack, offset, limit, contains, with_templates))
+
+    @routes.post('/prompt_stylers/rescan')
+    async def rescan_packs_route(request):
+        # POST /prompt_stylers/rescan: pick up packs added to, changed in or removed from
+        # the extra pack directories without waiting for the next scan
+        added, changed, removed = await asyncio.get_running_loop().run_in_executor(None, rescan_style_packs)
+        return web.json_response({'added': added, 'changed': changed, 'removed': removed})
+
+    @routes.get('/prompt_stylers/metrics')
+    async def metrics_route(request):
+        # GET /prompt_stylers/metrics, add reset=1 to start the timers over after reading
+        # Measuring pack memory walks every loaded template, keep that off the event loop
+        snapshot = await asyncio.get_running_loop().run_in_executor(None, metrics_snapshot)
+        if request.query.get('reset') == '1':
+            reset_metrics()
+        return web.json_response(snapshot)
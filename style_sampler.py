@@ -0,0 +1,93 @@
+import random
+
+from .style_memo import LRUCache
+from .style_metrics import add_metrics_source
+from .style_registry import get_style_packs
+
+
+class AliasTable:
+    # Vose's alias method: O(n) to build, O(1) per weighted draw
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("At least one positive weight is required.")
+
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [0.0] * count
+        self.alias = [0] * count
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] = scaled[high] + scaled[low] - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+
+        # Leftovers are 1.0 up to rounding
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def sample(self, rng):
+        # Only Random.random() is used, its sequence for a given seed is the same on
+        # every platform, so workers seeded alike draw alike
+        u = rng.random() * len(self.probability)
+        column = min(int(u), len(self.probability) - 1)
+        return column if u - column < self.probability[column] else self.alias[column]
+
+
+class StyleSampler:
+    # Weighted choice of a pack, then a uniform choice of one of its styles
+
+    def __init__(self, pack_weights, style_packs):
+        self.packs = []
+        weights = []
+        for pack, weight in pack_weights:
+            names = style_packs[pack].names
+            if weight > 0 and names:
+                self.packs.append((pack, names))
+                weights.append(weight)
+        self._table = AliasTable(weights)
+
+    def sample(self, rng):
+        pack, names = self.packs[self._table.sample(rng)]
+        return pack, names[min(int(rng.random() * len(names)), len(names) - 1)]
+
+
+def parse_pack_weights(text):
+    # "mood:1, artists:2" (commas or new lines) into [(pack, weight)], weight defaults to 1
+    pack_weights = []
+    for item in text.replace('\n', ',').split(','):
+        pack, _, weight = item.partition(':')
+        if pack.strip():
+            pack_weights.append((pack.strip(), float(weight) if weight.strip() else 1.0))
+    return pack_weights
+
+
+# Samplers keyed by the weights and the signatures of the packs they were built from
+_samplers = LRUCache(32)
+add_metrics_source('sampler_cache', _samplers.stats)
+
+
+def get_style_sampler(pack_weights, style_packs=None):
+    # style_packs: {pack name: StylePack} the draw is made from, see get_style_packs
+    pack_weights = tuple(pack_weights)
+    if style_packs is None:
+        style_packs = get_style_packs(pack for pack, _ in pack_weights)
+    key = (pack_weights, tuple(style_packs[pack].signature for pack, _ in pack_weights))
+    sampler = _samplers.get(key)
+    if sampler is None:
+        sampler = StyleSampler(pack_weights, style_packs)
+        _samplers.put(key, sampler)
+    return sampler
+
+
+def sample_styles(pack_weights, seed, count=1, style_packs=None):
+    # Reproducible draw of count (pack, style name) pairs for a seed
+    sampler = get_style_sampler(pack_weights, style_packs)
+    rng = random.Random(seed)
+    return [sampler.sample(rng) for _ in range(count)]
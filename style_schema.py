@@ -0,0 +1,199 @@
+import json
+import math
+import os
+import re
+from array import array
+from collections import namedtuple
+
+from .style_stream import iter_pack_entries
+
+# Validation and normalization of a style pack, run once when the pack loads so the
+# styling path only ever sees clean records:
+#   - an entry must be an object with a non-empty string 'name' and a 'prompt' key
+#   - null and NaN prompts and negative prompts become "", a missing negative prompt too
+#   - numbers are converted to text, any other value rejects the entry
+# Duplicate names are kept here, the pack index decides which definition wins.
+
+# Text of the packs being loaded goes through one table, so identical names, prompts,
+# negative prompts and template segments are held once however many packs contain
+# them. The registry starts a new table whenever it publishes packs: the table never
+# outlives the packs it was filled for, and the text of a reloaded or removed pack is
+# freed with it (sys.intern strings are never freed on recent Pythons).
+_shared_text = {}
+
+# A clean, immutable style entry
+StyleRecord = namedtuple('StyleRecord', ('name', 'prompt', 'negative_prompt'))
+
+# How many line numbers of normalized fields the load message lists
+REPORT_LIMIT = 5
+
+# Pack files of this size and larger are streamed, see read_style_records
+STREAM_BYTES = int(os.environ.get('PROMPT_STYLERS_STREAM_BYTES', str(16 * 1024 * 1024)))
+
+_SEPARATOR = re.compile(r'[\s,]*')
+
+
+def share_text(text):
+    # The shared copy of text
+    return _shared_text.setdefault(text, text)
+
+
+def reset_shared_text():
+    # Packs loaded from now on share text among themselves only
+    global _shared_text
+    _shared_text = {}
+
+
+def _normalize_text(value):
+    # Returns (text, problem), text is None when the value can not be used
+    if isinstance(value, str):
+        return value, None
+    if value is None:
+        return "", "is null"
+    if isinstance(value, float) and math.isnan(value):
+        return "", "is NaN"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value), "is a number"
+    return None, f"is {type(value).__name__}, expected a string"
+
+
+def validate_style_pack(json_data):
+    # Returns (records, fixed, rejected): the StyleRecords in file order, and
+    # (entry position, message) pairs for every field that was normalized and every
+    # entry that was dropped
+    if not isinstance(json_data, list):
+        return [], [], [(None, "expected a list of styles")]
+    return validate_style_entries(json_data)
+
+
+def validate_style_entries(entries):
+    # validate_style_pack over any iterable of entries, e.g. a pack being streamed
+    fixed = []
+    rejected = []
+    records = list(iter_style_records(entries, fixed, rejected))
+    return records, fixed, rejected
+
+
+def iter_style_records(entries, fixed, rejected):
+    # validate_style_entries one record at a time, for packs that are converted or
+    # copied without holding them; problems are appended to fixed and rejected
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            rejected.append((position, f"entry is {type(entry).__name__}, expected an object"))
+            continue
+
+        name = entry.get('name')
+        if not isinstance(name, str) or not name.strip():
+            rejected.append((position, "missing or empty 'name'"))
+            continue
+        if 'prompt' not in entry:
+            rejected.append((position, f"'{name}': missing 'prompt'"))
+            continue
+
+        fields = []
+        for field in ('prompt', 'negative_prompt'):
+            text, problem = _normalize_text(entry.get(field, ""))
+            if text is None:
+                rejected.append((position, f"'{name}': {field} {problem}"))
+                break
+            if problem:
+                fixed.append((position, f"'{name}': {field} {problem}, replaced with {text!r}"))
+            fields.append(share_text(text))
+        else:
+            yield StyleRecord(share_text(name), fields[0], fields[1])
+
+
+def entry_lines(file_path):
+    # Line number of every top-level entry of a JSON list file. Only needed for
+    # diagnostics, so the file is read again instead of tracking positions on every load.
+    try:
+        with open(file_path, 'r', encoding='utf8', errors='ignore') as file:
+            text = file.read()
+    except OSError:
+        return []
+
+    decoder = json.JSONDecoder()
+    lines = []
+    position = text.find('[') + 1
+    line = text.count('\n', 0, position) + 1
+    try:
+        while position:
+            start = _SEPARATOR.match(text, position).end()
+            if start >= len(text) or text[start] == ']':
+                break
+            line += text.count('\n', position, start)
+            lines.append(line)
+            _, position = decoder.raw_decode(text, start)
+            line += text.count('\n', start, position)
+    except ValueError:
+        pass
+    return lines
+
+
+def format_problems(file_path, problems, lines=None):
+    # "sdxl_styles_misc.json:5123: entry 1029 'Rococo_': ..." for every problem
+    if lines is None:
+        lines = entry_lines(file_path) if problems and file_path else []
+    file_name = os.path.basename(file_path) if file_path else "<styles>"
+
+    messages = []
+    for position, message in problems:
+        if position is None:
+            messages.append(f"{file_name}: {message}")
+        elif position < len(lines):
+            messages.append(f"{file_name}:{lines[position]}: entry {position} {message}")
+        else:
+            messages.append(f"{file_name}: entry {position} {message}")
+    return messages
+
+
+def load_style_records(file_path, json_data):
+    # Validate a pack read from file_path and print what was fixed or dropped.
+    # Rejected entries are listed in full, normalized fields are summarized.
+    records, fixed, rejected = validate_style_pack(json_data)
+    report_problems(file_path, fixed, rejected, entry_lines(file_path) if fixed or rejected else [])
+    return records
+
+
+def read_style_records(file_path):
+    # Read, validate and report a pack file; None when it can not be read.
+    # JSON packs from STREAM_BYTES on, and packs in every other format, are streamed
+    # entry by entry so only the records are held, never the file or its list of
+    # dicts. Smaller JSON packs are read in one go, which is faster.
+    lines = array('I')
+    try:
+        if file_path.endswith('.json') and os.path.getsize(file_path) < STREAM_BYTES:
+            with open(file_path, 'r', encoding='utf8', errors='ignore') as file:
+                json_data = json.load(file)
+            return load_style_records(file_path, json_data)
+        records, fixed, rejected = validate_style_entries(iter_pack_entries(file_path, lines))
+    except (OSError, ValueError) as e:
+        print(f"An error occurred: {os.path.basename(file_path)}: {str(e)}")
+        return None
+
+    report_problems(file_path, fixed, rejected, lines)
+    return records
+
+
+def report_problems(file_path, fixed, rejected, lines):
+    # Print what load_style_records fixed or dropped, lines as from entry_lines
+    for message in format_problems(file_path, rejected, lines):
+        print(f"{message}, entry ignored")
+
+    if fixed:
+        shown = sorted({lines[position] for position, _ in fixed if position < len(lines)})
+        more = ", ..." if len(shown) > REPORT_LIMIT else ""
+        print(f"{os.path.basename(file_path)}: {len(fixed)} null, NaN or numeric field(s) normalized "
+              f"at line(s) {', '.join(map(str, shown[:REPORT_LIMIT]))}{more}")
+
+
+def validate_style_file(file_path):
+    # Full diagnostics of a pack file, for pack authors
+    lines = []
+    try:
+        records, fixed, rejected = validate_style_entries(iter_pack_entries(file_path, lines))
+    except (OSError, ValueError) as e:
+        return [], [], [f"{os.path.basename(file_path)}: {str(e)}"]
+
+    return records, format_problems(file_path, fixed, lines), format_problems(file_path, rejected, lines)
+
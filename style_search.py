@@ -0,0 +1,172 @@
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+
+from .style_metrics import timed
+from .style_registry import get_style_index, get_style_pack, list_style_packs, style_file_name
+
+# Relative weight of a query token found in each field of a style
+FIELD_WEIGHTS = (('name', 3.0), ('prompt', 1.0), ('negative_prompt', 0.25))
+
+_TOKEN = re.compile(r'[0-9a-z]+')
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if isinstance(text, str) else []
+
+
+def trigrams(text):
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class StylePackSegment:
+    # Inverted token index over name, prompt and negative_prompt of the styles of one
+    # pack, plus a trigram index over style names for substring and typo-tolerant
+    # matches. Segments are built per pack so a changed pack is re-indexed on its own.
+
+    def __init__(self, pack, index):
+        # index maps style names to templates
+        self.pack = pack
+        self.names = []
+        self.postings = defaultdict(dict)
+        self.name_trigrams = defaultdict(list)
+
+        for name, template in index.items():
+            doc = len(self.names)
+            self.names.append(name)
+            for field, weight in FIELD_WEIGHTS:
+                for token in set(tokenize(getattr(template, field))):
+                    postings = self.postings[token]
+                    postings[doc] = postings.get(doc, 0.0) + weight
+            for trigram in trigrams(name):
+                self.name_trigrams[trigram].append(doc)
+
+        self.vocabulary = sorted(self.postings)
+
+    def prefixed(self, prefix):
+        # Vocabulary tokens starting with prefix, found with a binary search
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + '￿')
+        return self.vocabulary[start:end]
+
+
+class StyleSearchIndex:
+    # Search over the segments of every pack. Document frequencies are summed over the
+    # segments at query time, so scores are the same as with one index over all packs.
+
+    def __init__(self, packs=(), segments=None):
+        # packs: iterable of (pack, index) where index maps style names to templates
+        self.segments = list(segments) if segments is not None else [StylePackSegment(pack, index) for pack, index in packs]
+        # Documents are numbered across the segments, each segment's from its offset on
+        self.documents = []
+        self._offsets = []
+        for segment in self.segments:
+            self._offsets.append(len(self.documents))
+            self.documents.extend((segment.pack, name) for name in segment.names)
+        # Merged over the segments on first use; the index never changes, so a racing
+        # thread at most computes the same value twice
+        self._idfs = {}
+        self._prefixes = {}
+
+    def _idf(self, token):
+        idf = self._idfs.get(token)
+        if idf is None:
+            frequency = sum(len(segment.postings[token]) for segment in self.segments if token in segment.postings)
+            idf = self._idfs[token] = math.log(1 + len(self.documents) / frequency)
+        return idf
+
+    def _prefixed(self, prefix):
+        matches = self._prefixes.get(prefix)
+        if matches is None:
+            matches = self._prefixes[prefix] = sorted({match for segment in self.segments for match in segment.prefixed(prefix)})
+        return matches
+
+    def search(self, query, limit=20, packs=None):
+        segments = [(segment, offset) for segment, offset in zip(self.segments, self._offsets)
+                    if packs is None or segment.pack in packs]
+        scores = defaultdict(float)
+
+        for token in set(tokenize(query)):
+            matches = [(token, 1.0)] if any(token in segment.postings for segment in self.segments) else []
+            # Partial words still count, at half weight, so results show while typing
+            matches += [(match, 0.5) for match in self._prefixed(token)[:50] if match != token]
+            for match, factor in matches:
+                idf = self._idf(match) * factor
+                for segment, offset in segments:
+                    postings = segment.postings.get(match)
+                    if postings:
+                        for doc, weight in postings.items():
+                            scores[offset + doc] += weight * idf
+
+        query_trigrams = trigrams(query.strip())
+        if len(query_trigrams) > 2:
+            overlap = defaultdict(int)
+            for segment, offset in segments:
+                for trigram in query_trigrams:
+                    for doc in segment.name_trigrams.get(trigram, ()):
+                        overlap[offset + doc] += 1
+            for doc, count in overlap.items():
+                similarity = count / len(query_trigrams)
+                if similarity >= 0.5:
+                    scores[doc] += 4.0 * similarity
+
+        needle = query.strip().lower()
+        results = []
+        for doc, score in scores.items():
+            pack, name = self.documents[doc]
+            if needle and needle in name.lower():
+                score += 4.0
+            results.append((score, pack, name))
+
+        results.sort(key=lambda result: (-result[0], result[1], result[2]))
+        return results[:limit]
+
+
+# (pack signatures, index) published as one tuple, so readers never pair an index
+# with the signatures of another
+_search_state = (None, None)
+_search_lock = threading.Lock()
+
+
+def get_search_index():
+    # Built on first use. When packs were reloaded, added or removed only their
+    # segments are rebuilt, the others are taken over from the previous index.
+    global _search_state
+
+    key = tuple((pack, get_style_pack(style_file_name(pack)).signature) for pack in list_style_packs())
+    search_key, search_index = _search_state
+    if search_index is not None and key == search_key:
+        return search_index
+
+    with _search_lock:
+        search_key, search_index = _search_state
+        if search_index is None or key != search_key:
+            previous = dict(zip(search_key, search_index.segments)) if search_index is not None else {}
+            segments = []
+            for entry in key:
+                segment = previous.get(entry)
+                if segment is None:
+                    with timed('search_index_build', entry[0]):
+                        segment = StylePackSegment(entry[0], get_style_index(style_file_name(entry[0])))
+                segments.append(segment)
+            search_index = StyleSearchIndex(segments=segments)
+            _search_state = (key, search_index)
+    return search_index
+
+
+def search_styles(query, limit=20, packs=None):
+    # Ranked styles matching query, best first
+    results = []
+    for score, pack, name in get_search_index().search(query, limit, packs):
+        template = get_style_index(style_file_name(pack))[name]
+        results.append({
+            'pack': pack,
+            'name': name,
+            'score': round(score, 3),
+            'prompt': template.prompt,
+            'negative_prompt': template.negative_prompt,
+        })
+    return results
@@ -0,0 +1,220 @@
+import csv
+import json
+import pathlib
+import re
+import sqlite3
+
+# Incremental reading of style packs: entries are decoded one at a time from a buffer
+# of at most a few chunks, so loading a pack never holds the whole file or the whole
+# list of dicts in memory, only the records built from it. Formats:
+#   - .json     a JSON list of entries, the format of the bundled packs
+#   - .jsonl    JSON Lines, one entry object per line, blank lines are skipped
+#   - .csv      a header row naming the name, prompt and negative_prompt columns,
+#               then one style per row; other columns are ignored
+#   - .sqlite   a styles table, see SQLITE_SCHEMA; .sqlite3 and .db too
+CHUNK_SIZE = 1 << 20
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+# Rows are kept in file order by position; the index on name answers lookups
+SQLITE_SCHEMA = (
+    "CREATE TABLE styles (position INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+    "prompt TEXT NOT NULL, negative_prompt TEXT NOT NULL DEFAULT '')",
+    "CREATE INDEX styles_name ON styles (name, position)",
+)
+# Rows read per query when a SQLite pack is read in full
+SQLITE_BATCH = 1000
+
+# A byte order mark at the start of the file is skipped like whitespace
+_WHITESPACE = re.compile(r'[ \t\n\r\ufeff]*')
+# Whitespace and the comma between two entries
+_SEPARATOR = re.compile(r'[ \t\n\r]*(,[ \t\n\r]*)?')
+# Whitespace as json.load allows it after the list
+_TRAILING = re.compile(r'[ \t\n\r]*')
+
+
+def _read_more(file, text, position, size):
+    # Drop what was consumed and append the next chunk; None at the end of the file
+    chunk = file.read(size)
+    if not chunk:
+        return None
+    return text[position:] + chunk
+
+
+def _check_trailing(file, text, position, line):
+    # Only whitespace may follow the list, as for json.load: a pack must not turn
+    # valid or invalid with its size
+    while True:
+        end = _TRAILING.match(text, position).end()
+        line += text.count('\n', position, end)
+        if end < len(text):
+            raise ValueError(f"line {line}: extra data after the list of styles")
+        text = file.read(CHUNK_SIZE)
+        if not text:
+            return
+        position = 0
+
+
+def _iter_json_list(file, lines):
+    scan_once = json.JSONDecoder().scan_once
+    text = ''
+    position = 0
+    line = 1
+    eof = False
+    size = CHUNK_SIZE
+    # 'open': before '[', 'first': after '[', 'next': after ',', 'after': after an entry
+    state = 'open'
+
+    while True:
+        start = _WHITESPACE.match(text, position).end()
+        line += text.count('\n', position, start)
+        position = start
+
+        if position == len(text):
+            more = None if eof else _read_more(file, text, position, CHUNK_SIZE)
+            if more is None:
+                raise ValueError(f"line {line}: unexpected end of file, the list of styles is not closed"
+                                 if state != 'open' else "empty file, expected a list of styles")
+            text, position = more, 0
+            continue
+
+        char = text[position]
+        if state == 'open':
+            if char != '[':
+                raise ValueError(f"line {line}: expected a list of styles")
+            position += 1
+            state = 'first'
+            continue
+        if state == 'after':
+            if char == ']':
+                _check_trailing(file, text, position + 1, line)
+                return
+            if char != ',':
+                raise ValueError(f"line {line}: expected ',' or ']' after an entry")
+            position += 1
+            state = 'next'
+            continue
+        if char == ']' and state == 'first':
+            _check_trailing(file, text, position + 1, line)
+            return
+
+        # Decode entries back to back while they are complete in the buffer. A value
+        # that fails to decode or may be cut off is tried again with more text:
+        # objects, lists and strings end with their closing character, but a number
+        # or literal near the end of the buffer may still go on ("2." of "2.5").
+        limit = len(text) - 16
+        while True:
+            try:
+                entry, end = scan_once(text, position)
+            except (StopIteration, json.JSONDecodeError) as e:
+                if isinstance(e, StopIteration):
+                    error, error_position = "Expecting value", e.value
+                else:
+                    error, error_position = e.msg, e.pos
+                # Cut off by the end of the buffer, the error is at its last few
+                # characters (a partial literal or escape) or in a string running up to it
+                if eof or not (error_position >= limit or error.startswith('Unterminated string')):
+                    error_line = line + text.count('\n', position, error_position)
+                    raise ValueError(f"line {error_line}: {error}")
+                end = len(text)
+
+            if end >= limit and not eof and (end == len(text) or text[position] not in '{["'):
+                # An entry larger than the buffer grows the reads, so it is not re-parsed too often
+                size = size * 2 if position == 0 else CHUNK_SIZE
+                more = _read_more(file, text, position, size)
+                if more is None:
+                    eof = True
+                else:
+                    text, position = more, 0
+                break
+
+            if lines is not None:
+                lines.append(line)
+            yield entry
+
+            separator = _SEPARATOR.match(text, end)
+            line += text.count('\n', position, separator.end())
+            position = separator.end()
+            if separator.group(1) is None:
+                state = 'after'
+                break
+            state = 'next'
+            if position == len(text):
+                break
+
+
+def _iter_json_lines(file, lines):
+    for line, raw in enumerate(file, 1):
+        if not raw.strip():
+            continue
+        try:
+            entry = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"line {line}: {str(e)}")
+        if lines is not None:
+            lines.append(line)
+        yield entry
+
+
+def _iter_csv(file, lines):
+    reader = csv.DictReader(file)
+    if reader.fieldnames is None or 'name' not in reader.fieldnames or 'prompt' not in reader.fieldnames:
+        raise ValueError("line 1: expected a header row with name and prompt columns")
+
+    line = reader.line_num
+    for row in reader:
+        # line_num is the last line of the row, a quoted prompt may span several
+        if lines is not None:
+            lines.append(line + 1)
+        line = reader.line_num
+        yield row
+
+
+def connect_sqlite_pack(file_path):
+    # Read-only connection, usable from any thread; callers serialize their queries
+    return sqlite3.connect(pathlib.Path(file_path).absolute().as_uri() + '?mode=ro', uri=True, check_same_thread=False)
+
+
+def _iter_sqlite(file_path, lines):
+    # Rows in batches by position, so no query result holds the whole table
+    try:
+        connection = connect_sqlite_pack(file_path)
+    except sqlite3.Error as e:
+        raise ValueError(str(e))
+
+    try:
+        position = None
+        while True:
+            rows = connection.execute(
+                "SELECT position, name, prompt, negative_prompt FROM styles WHERE position > ? ORDER BY position LIMIT ?",
+                (-2**63 if position is None else position, SQLITE_BATCH)).fetchall()
+            for position, name, prompt, negative_prompt in rows:
+                if lines is not None:
+                    lines.append(position)
+                yield {'name': name, 'prompt': prompt, 'negative_prompt': negative_prompt}
+            if len(rows) < SQLITE_BATCH:
+                return
+    except sqlite3.Error as e:
+        raise ValueError(str(e))
+    finally:
+        connection.close()
+
+
+def iter_pack_entries(file_path, lines=None):
+    # Entries of a pack file in file order. When lines is given the line number of
+    # every entry is appended to it, for diagnostics (the position of a SQLite row).
+    # Raises OSError or ValueError.
+    if file_path.endswith(SQLITE_EXTENSIONS):
+        yield from _iter_sqlite(file_path, lines)
+        return
+
+    if file_path.endswith('.csv'):
+        # Spreadsheets often start the file with a byte order mark
+        with open(file_path, 'r', encoding='utf-8-sig', errors='ignore', newline='') as file:
+            yield from _iter_csv(file, lines)
+        return
+
+    with open(file_path, 'r', encoding='utf8', errors='ignore') as file:
+        if file_path.endswith('.jsonl'):
+            yield from _iter_json_lines(file, lines)
+        else:
+            yield from _iter_json_list(file, lines)
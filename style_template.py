@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+from .style_schema import share_text
+
+# Placeholder replaced by the user's positive text
+PROMPT_PLACEHOLDER = '{prompt}'
+
+
+class StyleTemplate(namedtuple('StyleTemplate', ('name', 'prompt', 'negative_prompt', 'segments'))):
+    # A style compiled once when its pack loads. The prompt is pre-split into the
+    # literal segments around each {prompt} placeholder, so rendering is a single
+    # join instead of rescanning the template with str.replace on every call.
+    # Templates are built from validated records and are immutable, so they can be
+    # shared between threads and never need to be checked again.
+
+    __slots__ = ()
+
+    def __new__(cls, name, prompt, negative_prompt=""):
+        # Segments are shared too, so boilerplate common to many styles is held once
+        return super().__new__(cls, name, prompt, negative_prompt, tuple(map(share_text, prompt.split(PROMPT_PLACEHOLDER))))
+
+    def __getnewargs__(self):
+        return (self.name, self.prompt, self.negative_prompt)
+
+    @property
+    def placeholders(self):
+        # Templates without a placeholder ignore the user's positive text
+        return len(self.segments) - 1
+
+    def render(self, positive_prompt):
+        return positive_prompt.join(self.segments)
+
+
+def count_placeholders(prompt):
+    return prompt.count(PROMPT_PLACEHOLDER)
@@ -0,0 +1,245 @@
+import functools
+import gzip
+import hashlib
+import html
+import importlib.util
+import os
+import re
+import threading
+
+# CLIP token counts of prompts, so a style that pushes a prompt past CLIP's 77-token
+# window is caught before anything runs on the GPU. Counts use CLIP's own byte-pair
+# encoding with the merges file ComfyUI ships in comfy/sd1_tokenizer, or the one in
+# PROMPT_STYLERS_CLIP_MERGES (merges.txt, or open_clip's bpe_simple_vocab_16e6.txt.gz).
+# Without one they are estimated from word lengths, see tokenizer_name().
+CLIP_MERGES = os.environ.get('PROMPT_STYLERS_CLIP_MERGES', '')
+
+# 77 tokens per CLIP window, two of them start and end markers
+CLIP_TOKEN_BUDGET = int(os.environ.get('PROMPT_STYLERS_TOKEN_BUDGET', '75'))
+
+# Number of merges used by CLIP's tokenizer, the vocabulary files carry a few more
+_MERGE_COUNT = 49152 - 256 - 2
+_UNRANKED = float('inf')
+
+# CLIP's pre-tokenizer with \p{L} as [^\W\d_] and \p{N} as \d, the re module has no
+# Unicode classes. The start and end markers are never part of a styled prompt.
+_PIECE = re.compile(r"'s|'t|'re|'ve|'m|'ll|'d|[^\W\d_]+|\d|(?:[^\s\w]|_)+", re.IGNORECASE)
+# ComfyUI takes (text:1.2) emphasis apart before CLIP sees the text: the brackets and
+# weights are not tokens, escaped \( \) are
+_WEIGHT = re.compile(r':\s*-?\d+(?:\.\d+)?\s*(?=\))')
+_BRACKET = re.compile(r'(?<!\\)[()]')
+_EMPHASIS = re.compile(f"{_WEIGHT.pattern}|{_BRACKET.pattern}")
+_ESCAPE = re.compile(r'\\([()])')
+_WHITESPACE = re.compile(r'\s+')
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def _bytes_to_unicode():
+    # CLIP's reversible byte -> printable character table
+    printable = list(range(ord('!'), ord('~') + 1)) + list(range(ord('¡'), ord('¬') + 1)) + list(range(ord('®'), ord('ÿ') + 1))
+    characters = printable[:]
+    extra = 0
+    for byte in range(256):
+        if byte not in printable:
+            printable.append(byte)
+            characters.append(256 + extra)
+            extra += 1
+    return dict(zip(printable, map(chr, characters)))
+
+
+class ClipTokenizer:
+    # Byte-pair encoder of CLIP, counting only: token ids are never needed
+
+    def __init__(self, merges, name):
+        self.name = name
+        self._ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self._byte_encoder = _bytes_to_unicode()
+        self._cache = {}
+
+    def bpe_length(self, piece):
+        length = self._cache.get(piece)
+        if length is not None:
+            return length
+
+        word = [self._byte_encoder[byte] for byte in piece.encode('utf8')]
+        word[-1] += '</w>'
+        while len(word) > 1:
+            # Merge the best ranked adjacent pair everywhere it occurs
+            first, second = min(zip(word, word[1:]), key=lambda pair: self._ranks.get(pair, _UNRANKED))
+            if (first, second) not in self._ranks:
+                break
+            merged = []
+            i = 0
+            while i < len(word):
+                if i < len(word) - 1 and word[i] == first and word[i + 1] == second:
+                    merged.append(first + second)
+                    i += 2
+                else:
+                    merged.append(word[i])
+                    i += 1
+            word = merged
+
+        # Words repeat a lot across styles, but prompts can bring any text
+        if len(self._cache) > 100000:
+            self._cache.clear()
+        self._cache[piece] = len(word)
+        return len(word)
+
+
+def _read_merges(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf8') as file:
+        lines = file.read().split('\n')
+    # Both formats start with a version line
+    if lines and lines[0].startswith('#'):
+        lines = lines[1:]
+    return [tuple(line.split()) for line in lines[:_MERGE_COUNT] if len(line.split()) == 2]
+
+
+def find_merges_file():
+    # PROMPT_STYLERS_CLIP_MERGES, else the tokenizer files of the ComfyUI install
+    if CLIP_MERGES:
+        return CLIP_MERGES if os.path.isfile(CLIP_MERGES) else None
+    try:
+        spec = importlib.util.find_spec('comfy')
+    except (ImportError, ValueError):
+        spec = None
+    if spec is not None and spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            path = os.path.join(location, 'sd1_tokenizer', 'merges.txt')
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def get_tokenizer():
+    # The CLIP tokenizer, loaded on first use; None when no merges file was found
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                tokenizer = False
+                path = find_merges_file()
+                if path is not None:
+                    try:
+                        merges = _read_merges(path)
+                        digest = hashlib.blake2b(repr(merges).encode('utf8'), digest_size=8).hexdigest()
+                        tokenizer = ClipTokenizer(merges, f"clip-bpe-{digest}")
+                    except (OSError, ValueError) as e:
+                        print(f"An error occurred: {str(e)}")
+                _tokenizer = tokenizer
+    return _tokenizer or None
+
+
+def tokenizer_name():
+    # Identifies what the counts were computed with, stored with precomputed counts:
+    # 'clip-bpe-<merges digest>' or 'estimate'
+    tokenizer = get_tokenizer()
+    return tokenizer.name if tokenizer is not None else 'estimate'
+
+
+def _estimate_length(piece):
+    # Without the merges: CLIP's vocabulary holds most words up to about ten letters
+    # whole, longer and non-ASCII words split, punctuation mostly goes one mark per token
+    if piece[0].isalpha():
+        return 1 + (len(piece.encode('utf8')) - 1) // 10
+    return len(piece)
+
+
+def _piece_length(piece):
+    tokenizer = get_tokenizer()
+    return tokenizer.bpe_length(piece) if tokenizer is not None else _estimate_length(piece)
+
+
+def clip_text(text):
+    # The text as CLIP's tokenizer sees it after ComfyUI's emphasis parsing
+    text = _ESCAPE.sub(r'\1', _BRACKET.sub(' ', _WEIGHT.sub('', text)))
+    return _WHITESPACE.sub(' ', html.unescape(html.unescape(text))).strip().lower()
+
+
+def _count_tokens(text):
+    if not text:
+        return 0
+    return sum(_piece_length(piece) for piece in _PIECE.findall(clip_text(text)))
+
+
+# CLIP tokens of text without the start and end markers. Styles repeat the same texts,
+# so counts are remembered.
+count_tokens = functools.lru_cache(maxsize=4096)(_count_tokens)
+
+
+def template_token_counts(template):
+    # (tokens of the prompt around its {prompt} placeholders, tokens of the negative
+    # prompt) of a StyleTemplate
+    return sum(count_tokens(segment) for segment in template.segments), count_tokens(template.negative_prompt)
+
+
+def _emphasis_parts(text):
+    # text as (start, end, kind) parts: '(' and ')' for emphasis brackets, 'weight' for
+    # the :1.2 before a closing bracket and 'text' for the rest. The brackets become
+    # spaces for CLIP, so no token spans two parts and a text is counted part by part.
+    parts = []
+    position = 0
+    for match in _EMPHASIS.finditer(text):
+        if match.start() > position:
+            parts.append((position, match.start(), 'text'))
+        parts.append((match.start(), match.end(), match.group() if match.group() in ('(', ')') else 'weight'))
+        position = match.end()
+    if position < len(text):
+        parts.append((position, len(text), 'text'))
+    return parts
+
+
+def _cut_text(text, start, end, budget):
+    # Position before the first word of text[start:end] past budget tokens
+    cuts = [start + match.start() for match in _PIECE.finditer(text[start:end])]
+    low, high = 0, len(cuts) - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _count_tokens(text[start:cuts[middle]]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return cuts[low] if cuts else start
+
+
+def truncate_to_tokens(text, budget=CLIP_TOKEN_BUDGET):
+    # The longest prefix of text, cut between words, that count_tokens puts within
+    # budget tokens, with trailing separators removed. Emphasis groups open at the cut
+    # are closed with their own weight, an unclosed bracket would weight everything
+    # ComfyUI appends after it; groups left empty by the cut are dropped.
+    if count_tokens(text) <= budget:
+        return text
+
+    parts = _emphasis_parts(text)
+    # Closing bracket of every group, with its weight
+    closing = {}
+    groups = []
+    for i, (start, end, kind) in enumerate(parts):
+        if kind == '(':
+            groups.append(i)
+        elif kind == ')' and groups:
+            weight = text[parts[i - 1][0]:parts[i - 1][1]].strip() if parts[i - 1][2] == 'weight' else ''
+            closing[groups.pop()] = weight + ')'
+
+    total = 0
+    groups = []
+    cut = len(text)
+    for i, (start, end, kind) in enumerate(parts):
+        if kind == '(':
+            groups.append(i)
+        elif kind == ')' and groups:
+            groups.pop()
+        elif kind == 'text':
+            tokens = count_tokens(text[start:end])
+            if total + tokens > budget:
+                cut = _cut_text(text, start, end, budget - total)
+                break
+            total += tokens
+
+    prefix = text[:cut].rstrip(' \t\n,.;:')
+    while groups and len(prefix) <= parts[groups[-1]][0] + 1:
+        prefix = text[:parts[groups.pop()][0]].rstrip(' \t\n,.;:')
+    return prefix + ''.join(closing.get(i, ')') for i in reversed(groups))
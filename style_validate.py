@@ -0,0 +1,28 @@
+import sys
+
+from .style_schema import validate_style_file
+
+# Checks pack files before they are added, with the same validation as when a pack
+# loads:
+#
+#   python -m ComfyUi_PromptStylers.style_validate sdxl_styles_mine.json ...
+#
+# Kept out of style_schema, which the package has already imported when python -m runs
+# a module of it. Exits with status 1 when any entry is rejected.
+
+
+def main(argv=None):
+    failed = False
+    for path in sys.argv[1:] if argv is None else argv:
+        records, fixed, rejected = validate_style_file(path)
+        for message in fixed:
+            print(f"warning: {message}")
+        for message in rejected:
+            print(f"error: {message}")
+        print(f"{path}: {len(records)} style(s), {len(fixed)} field(s) normalized, {len(rejected)} rejected")
+        failed = failed or bool(rejected)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())